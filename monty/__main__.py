@@ -10,7 +10,7 @@ import redis
 import redis.asyncio
 from sqlalchemy.ext.asyncio import create_async_engine
 
-from monty import constants, monkey_patches
+from monty import constants, launcher, monkey_patches
 from monty.bot import Monty
 from monty.migrations import run_alembic
 
@@ -81,6 +81,9 @@ async def main() -> None:
         intents=constants.Client.intents,
         command_sync_flags=constants.Client.command_sync_flags,
         proxy=constants.Client.proxy,
+        # without shards configured, a single process runs one shard, rather than fetching the recommended count
+        shard_count=constants.Client.shard_count or 1,
+        shard_ids=constants.Client.shard_ids,
     )
 
     await bot.login(constants.Client.token or "")
@@ -122,4 +125,6 @@ if __name__ == "__main__":
     disnake.Embed.set_default_colour(constants.Colours.python_yellow)
     monkey_patches.patch_typing()
     monkey_patches.patch_inter_send()
+    if constants.Client.processes > 1 and constants.Client.shard_ids is None:
+        sys.exit(asyncio.run(launcher.supervise(constants.Client.processes)))
     sys.exit(asyncio.run(main()))
@@ -1,6 +1,8 @@
 import asyncio
 import collections
 import datetime
+import itertools
+from collections.abc import Iterable
 from typing import Any, Literal, cast, final
 from weakref import WeakValueDictionary
 
@@ -14,6 +16,7 @@ import sqlalchemy as sa
 from disnake.ext import commands
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing_extensions import Self, override
 
 from monty import constants
@@ -21,11 +24,14 @@ from monty.aiohttp_session import AiohttpTransport, CachingClientSession, get_ca
 from monty.components import app_emoji_syncing
 from monty.database import Feature, Guild, GuildConfig
 from monty.database.rollouts import Rollout
+from monty.database.write_behind import WriteBehindQueue
 from monty.github_client import GitHubClient
 from monty.log import get_logger
 from monty.statsd import AsyncStatsClient
 from monty.utils import rollouts, scheduling
 from monty.utils.extensions import EXTENSIONS, walk_extensions
+from monty.utils.invalidation import Invalidation, InvalidationBus, InvalidationKind
+from monty.utils.singleton import SingletonElection
 
 
 log = get_logger(__name__)
@@ -33,9 +39,14 @@ log = get_logger(__name__)
 
 __all__ = ("Monty",)
 
+# Guild rows are preloaded in batches of up to this many guilds
+GUILD_PRELOAD_BATCH_SIZE = 500
+# How long to wait for more guilds to arrive before preloading a partial batch, in seconds
+GUILD_PRELOAD_DELAY = 1
+
 
 @final
-class Monty(commands.Bot):
+class Monty(commands.AutoShardedBot):
     """
     Base bot instance.
 
@@ -65,6 +76,15 @@ class Monty(commands.Bot):
         self.redis_session = redis_session
         self.redis_cache = cachingutils.redis.async_session(constants.Redis.prefix, session=self.redis_session)
         self.redis_cache_key = constants.Redis.prefix
+        # keeps the in-memory caches of every bot process coherent
+        self.invalidation_bus = InvalidationBus(self.redis_session)
+        self.invalidation_bus.subscribe(InvalidationKind.GUILD, self._on_guild_invalidated)
+        self.invalidation_bus.subscribe(InvalidationKind.GUILD_CONFIG, self._on_guild_config_invalidated)
+        self.invalidation_bus.subscribe(InvalidationKind.FEATURES, self._on_features_invalidated)
+        # only one process runs jobs such as refreshing the PyPI package list or updating rollouts
+        self.singleton = SingletonElection(
+            self.redis_session, self.invalidation_bus.origin, standalone=constants.Client.processes <= 1
+        )
 
         self.github: GitHubClient
         self.http_session: CachingClientSession
@@ -73,12 +93,24 @@ class Monty(commands.Bot):
 
         self.db_engine = database_engine
         self.db_session = async_sessionmaker(database_engine, expire_on_commit=False, class_=AsyncSession)
+        # batched writes of changes to cached guilds, configs, and features
+        self.db_writes = WriteBehindQueue(self.db_session)
 
         self.guild_configs: dict[int, GuildConfig] = {}
         self.guild_db: dict[int, Guild] = {}
         self.features: dict[str, Feature] = {}
+        # guild id -> names of the features whose rollouts include that guild, cleared along with the feature sets
+        self._rolled_out_features: dict[int, frozenset[str]] = {}
+        # guild id -> (version, names of the features enabled in that guild), see `get_guild_feature_set`
+        self._guild_feature_sets: dict[int | None, tuple[int, frozenset[str]]] = {}
+        self._feature_set_version = 0
         self._feature_db_lock = asyncio.Lock()
         self._guild_db_locks: WeakValueDictionary[int, asyncio.Lock] = WeakValueDictionary()
+        # guild id -> the pending bulk load that will fill its rows in the caches
+        self._guild_preloads: dict[int, asyncio.Future[None]] = {}
+        self._guild_preload_queue: list[int] = []
+        self._guild_preload_waiter: asyncio.Future[None] | None = None
+        self._guild_preload_timer: asyncio.TimerHandle | None = None
 
         self.socket_events = collections.Counter()
         self.start_time: arrow.Arrow
@@ -118,9 +150,72 @@ class Monty(commands.Bot):
             self.invite_permissions = constants.Client.default_invite_permissions
         return self.invite_permissions
 
+    def queue_guild_preload(self, guild_ids: Iterable[int]) -> None:
+        """
+        Queue the provided guilds to have their guild and config rows bulk loaded into the caches.
+
+        Guilds are loaded in batches with a single query per table, rather than one at a time as they are first used.
+        Until its batch is loaded, `ensure_guild` and `ensure_guild_config` wait for it instead of querying alone.
+        """
+        loop = asyncio.get_running_loop()
+        for guild_id in guild_ids:
+            if guild_id in self._guild_preloads or (guild_id in self.guild_db and guild_id in self.guild_configs):
+                continue
+            if self._guild_preload_waiter is None:
+                self._guild_preload_waiter = loop.create_future()
+            self._guild_preloads[guild_id] = self._guild_preload_waiter
+            self._guild_preload_queue.append(guild_id)
+            if len(self._guild_preload_queue) >= GUILD_PRELOAD_BATCH_SIZE:
+                self._flush_guild_preload()
+
+        if self._guild_preload_queue and self._guild_preload_timer is None:
+            self._guild_preload_timer = loop.call_later(GUILD_PRELOAD_DELAY, self._flush_guild_preload)
+
+    def _flush_guild_preload(self) -> None:
+        """Start loading all currently queued guilds."""
+        if self._guild_preload_timer is not None:
+            self._guild_preload_timer.cancel()
+            self._guild_preload_timer = None
+
+        batch, waiter = self._guild_preload_queue, self._guild_preload_waiter
+        self._guild_preload_queue = []
+        self._guild_preload_waiter = None
+        if batch and waiter is not None:
+            scheduling.create_task(self._preload_guilds(batch, waiter), name="preload-guilds")
+
+    async def _preload_guilds(self, guild_ids: list[int], waiter: asyncio.Future[None]) -> None:
+        """Load the guild and config rows of the provided guilds into the caches, without creating missing rows."""
+        try:
+            async with self.db.begin() as session:
+                guilds = await session.scalars(sa.select(Guild).where(Guild.id.in_(guild_ids)))
+                for guild in guilds:
+                    self.guild_db.setdefault(guild.id, guild)
+
+                stmt = (
+                    sa.select(GuildConfig).where(GuildConfig.id.in_(guild_ids)).options(selectinload(GuildConfig.guild))
+                )
+                configs = await session.scalars(stmt)
+                for config in configs:
+                    self.guild_configs.setdefault(config.id, config)
+            log.debug(f"Preloaded the rows of {len(guild_ids)} guilds.")
+        finally:
+            for guild_id in guild_ids:
+                if self._guild_preloads.get(guild_id) is waiter:
+                    del self._guild_preloads[guild_id]
+            waiter.set_result(None)
+
+    async def _wait_for_guild_preload(self, guild_id: int) -> None:
+        """Wait for the bulk load of the provided guild to finish, if one is pending."""
+        waiter = self._guild_preloads.get(guild_id)
+        if waiter is not None:
+            await asyncio.shield(waiter)
+
     async def ensure_guild(self, guild_id: int, *, session: AsyncSession | None = None) -> Guild:
         """Fetch and return a guild config, creating if it does not exist."""
         guild = self.guild_db.get(guild_id)
+        if not guild and guild_id in self._guild_preloads:
+            await self._wait_for_guild_preload(guild_id)
+            guild = self.guild_db.get(guild_id)
         if not guild:
             lock = self._guild_db_locks.get(guild_id)
             if not lock:
@@ -143,6 +238,9 @@ class Monty(commands.Bot):
     async def ensure_guild_config(self, guild_id: int) -> GuildConfig:
         """Fetch and return a guild config, creating if it does not exist."""
         config = self.guild_configs.get(guild_id)
+        if not config and guild_id in self._guild_preloads:
+            await self._wait_for_guild_preload(guild_id)
+            config = self.guild_configs.get(guild_id)
         if not config:
             async with self.db.begin() as session:
                 guild = await self.ensure_guild(guild_id, session=session)
@@ -162,6 +260,23 @@ class Monty(commands.Bot):
 
         return config
 
+    async def _on_guild_invalidated(self, invalidation: Invalidation) -> None:
+        """Drop a guild changed by another process, so it is refetched on next use."""
+        if isinstance(invalidation.key, int):
+            self.guild_db.pop(invalidation.key, None)
+            # the cached config holds the same outdated guild, and is reloaded along with it
+            self.guild_configs.pop(invalidation.key, None)
+            self.invalidate_guild_feature_sets()
+
+    async def _on_guild_config_invalidated(self, invalidation: Invalidation) -> None:
+        """Drop a guild config changed by another process, so it is refetched on next use."""
+        if isinstance(invalidation.key, int):
+            self.guild_configs.pop(invalidation.key, None)
+
+    async def _on_features_invalidated(self, invalidation: Invalidation) -> None:
+        """Reload the features and rollouts after another process changed them."""
+        await self.refresh_features()
+
     async def get_prefix(self, message: disnake.Message) -> list[str] | str | None:
         """Get the bot prefix."""
         prefixes = commands.when_mentioned(self, message)
@@ -200,9 +315,116 @@ class Monty(commands.Bot):
                 features = result.all()
             self.features.clear()
             self.features.update({feature.name: feature for feature in features})
+            self.invalidate_guild_feature_sets()
 
         log.info("Fetched the features from the database.")
 
+    @staticmethod
+    def _get_loaded_rollout(feature: Feature) -> Rollout | None:
+        """Return the rollout of the provided feature if it was loaded alongside the feature and is still current."""
+        if feature.rollout_id is None or "rollout" in sa.inspect(feature).unloaded:
+            return None
+        rollout = feature.rollout
+        if rollout is None or rollout.id != feature.rollout_id:
+            return None
+        return rollout
+
+    async def _load_missing_rollouts(self) -> None:
+        """
+        Load the rollouts of the cached features which are linked to a rollout that was not loaded with them.
+
+        The feature sets are invalidated if any rollout was loaded, so they are recomputed with it.
+        """
+        missing = [
+            feature
+            for feature in self.features.values()
+            if feature.rollout_id is not None and self._get_loaded_rollout(feature) is None
+        ]
+        if not missing:
+            return
+
+        async with self.db.begin() as session:
+            result = await session.scalars(
+                sa.select(Rollout).where(Rollout.id.in_({feature.rollout_id for feature in missing}))
+            )
+            loaded = {rollout.id: rollout for rollout in result}
+
+        for feature in missing:
+            if rollout := loaded.get(feature.rollout_id):
+                # don't mark the cached feature as modified, as the rollout is already linked in the database
+                set_committed_value(feature, "rollout", rollout)
+        if loaded:
+            self.invalidate_guild_feature_sets()
+
+    def get_rolled_out_features(self, guild_id: int) -> frozenset[str]:
+        """
+        Return the names of every feature with a rollout that currently includes the provided guild.
+
+        This is computed once per guild from the cached features and their rollouts,
+        and is recomputed after the feature sets are invalidated, such as when a feature is linked to a rollout.
+        """
+        rolled_out = self._rolled_out_features.get(guild_id)
+        if rolled_out is not None:
+            return rolled_out
+
+        names = set()
+        complete = True
+        for feature in self.features.values():
+            if feature.rollout_id is None:
+                continue
+            rollout = self._get_loaded_rollout(feature)
+            if rollout is None:
+                # the cached feature is stale; don't keep a result that may be missing it
+                complete = False
+                continue
+            if rollouts.is_rolled_out_to(guild_id, rollout=rollout):
+                names.add(feature.name)
+
+        rolled_out = frozenset(names)
+        if complete:
+            self._rolled_out_features[guild_id] = rolled_out
+        return rolled_out
+
+    def invalidate_guild_feature_sets(self) -> None:
+        """
+        Mark every cached guild feature set, and the features rolled out to each guild, as outdated.
+
+        This must be called after changing a feature's status or rollout, or a guild's features, in the caches.
+        """
+        self._rolled_out_features.clear()
+        self._feature_set_version += 1
+
+    async def get_guild_feature_set(self, guild_id: int | None) -> frozenset[str]:
+        """
+        Return the names of all features enabled for the provided guild.
+
+        This matches `guild_has_feature` for every existing feature, but is computed once per guild from the cached
+        features, guild, and rollouts, so checking any number of features only costs a lookup in the returned set.
+        Results are kept until `invalidate_guild_feature_sets` is called or the features are refreshed.
+        """
+        version = self._feature_set_version
+        cached = self._guild_feature_sets.get(guild_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if guild_id is not None:
+            await self._load_missing_rollouts()
+            version = self._feature_set_version
+
+        names = {name for name, feature in self.features.items() if feature.enabled}
+        if guild_id is not None:
+            guild_db = await self.ensure_guild(guild_id)
+            for name in itertools.chain(guild_db.feature_ids, self.get_rolled_out_features(guild_id)):
+                feature = self.features.get(name)
+                if feature is None or feature.enabled is None:
+                    names.add(name)
+
+        feature_set = frozenset(names)
+        # don't keep results computed from outdated caches, or from features missing their rollouts
+        if self._feature_set_version == version and (guild_id is None or guild_id in self._rolled_out_features):
+            self._guild_feature_sets[guild_id] = (version, feature_set)
+        return feature_set
+
     async def guild_has_feature(
         self,
         guild: int | disnake.abc.Snowflake | None,
@@ -258,6 +480,11 @@ class Monty(commands.Bot):
 
         # check if this feature has an active rollout
         if feature_instance and feature_instance.rollout_id:
+            if self._get_loaded_rollout(feature_instance) is None:
+                await self._load_missing_rollouts()
+            if self._get_loaded_rollout(feature_instance) is not None:
+                return feature in self.get_rolled_out_features(guild)
+
             async with self.db.begin() as session:
                 rollout = await session.get(Rollout, feature_instance.rollout_id)
                 if not rollout:
@@ -275,6 +502,8 @@ class Monty(commands.Bot):
     async def login(self, token: str) -> None:
         """Login to Discord and set the bot's start time."""
         self.start_time = arrow.utcnow()
+        self.invalidation_bus.start()
+        self.singleton.start()
         self.stats = AsyncStatsClient(
             host=constants.Stats.host,
             port=constants.Stats.port,
@@ -294,10 +523,13 @@ class Monty(commands.Bot):
             log.warning("Bot is shutting down; closing sessions.")
         else:
             log.info("Bot is shutting down; closing sessions.")
+        await self.invalidation_bus.close()
+        await self.singleton.close()
         if self.http_session:
             await self.http_session.close()
             log.debug("HTTP session closed.")
         if self.db_engine:
+            await self.db_writes.flush()
             await self.db_engine.dispose()
             log.debug("Database engine disposed.")
 
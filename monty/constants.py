@@ -1,5 +1,6 @@
 import dataclasses
 import enum
+import pathlib
 import sys
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Annotated, Any, ClassVar, Literal
@@ -82,6 +83,16 @@ class ClientCls(BaseSettings):
         ),
     ] = None
     extensions: set[str] | bool | None = Field(None, validation_alias="BOT_EXTENSIONS")
+    # files which are cached on disk, such as indexes shared between the processes on a host
+    cache_directory: pathlib.Path = Field(pathlib.Path("cache"), validation_alias="BOT_CACHE_DIR")
+
+    # sharding
+    # number of worker processes to split the shards between, see monty.launcher
+    processes: int = Field(1, validation_alias="BOT_PROCESSES", ge=1)
+    # total number of shards, defaults to the count recommended by Discord
+    shard_count: int | None = Field(None, validation_alias="BOT_SHARD_COUNT", ge=1)
+    # the shards run by this process, set by the launcher for each worker
+    shard_ids: list[int] | None = Field(None, validation_alias="BOT_SHARD_IDS")
 
     @field_validator("extensions", mode="before")
     @classmethod
@@ -0,0 +1,140 @@
+"""
+Write-behind batching for updates to existing rows.
+
+Callers update their cached objects immediately and queue the changed attributes here. Updates are coalesced per row
+and written shortly after, with a single `UPDATE ... FROM (VALUES ...)` statement per table and set of columns.
+"""
+
+import asyncio
+import collections
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from monty.database.base import Base
+from monty.log import get_logger
+from monty.utils import scheduling
+
+
+log = get_logger(__name__)
+
+# How long to wait for more updates before writing the queued ones, in seconds
+DEFAULT_FLUSH_DELAY = 1.0
+
+
+def _retrieve_exception(future: asyncio.Future[None]) -> None:
+    # failures are logged when writing, so nobody is required to await the returned futures
+    if not future.cancelled():
+        future.exception()
+
+
+class WriteBehindQueue:
+    """A queue of updates to existing rows, which are coalesced per row and written in batches."""
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        *,
+        delay: float = DEFAULT_FLUSH_DELAY,
+    ) -> None:
+        self._sessionmaker = sessionmaker
+        self._delay = delay
+        # (model, primary key) -> attribute name -> value to write
+        self._pending: dict[tuple[type[Base], Any], dict[str, Any]] = {}
+        self._waiter: asyncio.Future[None] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        # writes are serialised so that a later flush can never be overwritten by an earlier one
+        self._write_lock = asyncio.Lock()
+        self._writes: set[asyncio.Task[None]] = set()
+
+    def queue(self, obj: Base, *attrs: str) -> "asyncio.Future[None]":
+        """
+        Queue the current values of the provided attributes of `obj` to be written to its existing row.
+
+        Returns a future which completes once the update has been committed, and can be awaited when durability
+        is required. Awaiting it is optional, failed writes are always logged.
+        """
+        model = type(obj)
+        mapper = sa.inspect(model)
+        if len(mapper.primary_key) != 1:
+            msg = f"{model.__name__} must have a single primary key column to be queued."
+            raise TypeError(msg)
+
+        (primary_key,) = mapper.primary_key_from_instance(obj)
+        values = self._pending.setdefault((model, primary_key), {})
+        for attr in attrs:
+            value = getattr(obj, attr)
+            # copy mutable values so later in-place changes are only written when queued again
+            values[attr] = list(value) if isinstance(value, list) else value
+
+        loop = asyncio.get_running_loop()
+        if self._waiter is None:
+            self._waiter = loop.create_future()
+            self._waiter.add_done_callback(_retrieve_exception)
+        if self._timer is None:
+            self._timer = loop.call_later(self._delay, self._start_write)
+
+        waiter = asyncio.shield(self._waiter)
+        waiter.add_done_callback(_retrieve_exception)
+        return waiter
+
+    async def flush(self) -> None:
+        """Write all queued updates now, and wait for every write in progress to finish."""
+        self._start_write()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def _start_write(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, waiter = self._pending, self._waiter
+        self._pending = {}
+        self._waiter = None
+        if not pending or waiter is None:
+            return
+
+        task = scheduling.create_task(self._write(pending, waiter), name="write-behind")
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write(self, pending: dict[tuple[type[Base], Any], dict[str, Any]], waiter: asyncio.Future[None]) -> None:
+        # group rows which update the same columns of the same table into one statement
+        groups: dict[tuple[type[Base], tuple[str, ...]], list[tuple[Any, dict[str, Any]]]] = collections.defaultdict(
+            list
+        )
+        for (model, primary_key), values in pending.items():
+            groups[model, tuple(sorted(values))].append((primary_key, values))
+
+        try:
+            async with self._write_lock, self._sessionmaker.begin() as session:
+                for (model, attrs), rows in groups.items():
+                    await session.execute(self._build_update(model, attrs, rows))
+        except Exception as e:
+            log.exception(f"Failed to write {len(pending)} queued row updates.")
+            waiter.set_exception(e)
+        else:
+            log.debug(f"Wrote {len(pending)} queued row updates in {len(groups)} statements.")
+            waiter.set_result(None)
+
+    @staticmethod
+    def _build_update(model: type[Base], attrs: tuple[str, ...], rows: list[tuple[Any, dict[str, Any]]]) -> sa.Update:
+        """Build an `UPDATE ... FROM (VALUES ...)` statement setting the provided attributes for every row."""
+        mapper = sa.inspect(model)
+        table = mapper.local_table
+        primary_key = mapper.primary_key[0]
+        columns = [mapper.columns[attr] for attr in attrs]
+
+        updates = sa.values(
+            sa.column(primary_key.name, primary_key.type),
+            *(sa.column(column.name, column.type) for column in columns),
+            name="updates",
+        ).data([(key, *(values[attr] for attr in attrs)) for key, values in rows])
+
+        return (
+            sa.update(table)
+            .where(table.c[primary_key.name] == updates.c[primary_key.name])
+            .values({column.name: updates.c[column.name] for column in columns})
+        )
@@ -2,6 +2,8 @@
 import dataclasses
 import enum
 import functools
+import re
+from typing import ClassVar, Literal
 
 import disnake
 
@@ -14,12 +16,46 @@ class MontyEvent(enum.Enum):
     monty_message_processed = "monty_message_processed"
 
 
+@dataclasses.dataclass(frozen=True)
+class MessageExtractor:
+    """
+    A pattern which is run over every processed message, with results shared between listeners.
+
+    `source` selects what the pattern is run against: the raw `content`, the `text` with code blocks removed,
+    or each of the message `urls`, which must be fully matched.
+
+    `trigger` is an optional literal which must be present (case-insensitively) in the raw content for the pattern
+    to be able to match at all. Messages without it skip running the pattern entirely.
+    """
+
+    name: str
+    pattern: re.Pattern[str]
+    source: Literal["content", "text", "urls"] = "content"
+    trigger: str | None = None
+
+
 @dataclasses.dataclass(frozen=True)
 class MessageContext:
     """A context for a message event."""
 
     content: str
 
+    _extractors: ClassVar[dict[str, MessageExtractor]] = {}
+
+    _extracted: dict[str, list[re.Match[str]]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def register_extractor(cls, extractor: MessageExtractor) -> MessageExtractor:
+        """Register an extractor to be shared by all message listeners, returning it for convenience."""
+        existing = cls._extractors.get(extractor.name)
+        if existing is not None and existing != extractor:
+            msg = f"An extractor named {extractor.name!r} is already registered."
+            raise ValueError(msg)
+        cls._extractors[extractor.name] = extractor
+        return extractor
+
     # Lazily initialize attributes
     @functools.cached_property
     def code(self) -> str | None:
@@ -36,6 +72,34 @@ class MessageContext:
         """Return the URLs found in the message."""
         return list(extract_urls(self.text))
 
+    @functools.cached_property
+    def _casefolded_content(self) -> str:
+        return self.content.casefold()
+
+    def extract(self, extractor: MessageExtractor | str) -> list[re.Match[str]]:
+        """
+        Return the matches of the provided registered extractor.
+
+        Results are computed once per message and shared between every listener that requests them.
+        """
+        if isinstance(extractor, str):
+            extractor = self._extractors[extractor]
+
+        if (matches := self._extracted.get(extractor.name)) is not None:
+            return matches
+
+        if extractor.trigger is not None and extractor.trigger.casefold() not in self._casefolded_content:
+            matches = []
+        elif extractor.source == "urls":
+            matches = [match for match in map(extractor.pattern.fullmatch, self.urls) if match]
+        elif extractor.source == "text":
+            matches = list(extractor.pattern.finditer(self.text))
+        else:
+            matches = list(extractor.pattern.finditer(self.content))
+
+        self._extracted[extractor.name] = matches
+        return matches
+
     @classmethod
     def from_message_inter(
         cls, inter: disnake.MessageInteraction | disnake.MessageCommandInteraction, /
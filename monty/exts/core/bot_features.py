@@ -12,6 +12,7 @@ from monty.database import Feature
 from monty.database.guild import Guild
 from monty.log import get_logger
 from monty.metadata import ExtMetadata
+from monty.utils.invalidation import InvalidationKind
 from monty.utils.messages import DeleteButton
 
 
@@ -56,6 +57,7 @@ class FeatureManagement(commands.Cog, name="Feature Management"):
     def refresh_in_cache(self, feature: Feature) -> None:
         """Replace the item in cache with the same name as the provided feature."""
         self.features[feature.name] = feature
+        self.bot.invalidate_guild_feature_sets()
 
     async def wait_for_confirmation(
         self,
@@ -165,11 +167,10 @@ class FeatureManagement(commands.Cog, name="Feature Management"):
             # already set, return early
             return feature
 
-        async with self.bot.db.begin() as session:
-            feature = await session.merge(feature)
-            feature.enabled = status
-            await session.commit()
-            self.refresh_in_cache(feature)
+        feature.enabled = status
+        self.refresh_in_cache(feature)
+        await self.bot.db_writes.queue(feature, "enabled")
+        await self.bot.invalidation_bus.publish(InvalidationKind.FEATURES, feature.name)
 
         return feature
 
@@ -673,6 +674,7 @@ class FeatureManagement(commands.Cog, name="Feature Management"):
                         "One or more of the provided features do not exist: `" + "`, `".join(invalids) + "`."
                     )
             guild_dbs: list[Guild] = []
+            writes: list[asyncio.Future[None]] = []
             for guild in guilds:
                 guild_db = await self.bot.ensure_guild(guild.id)
                 guild_dbs.append(guild_db)
@@ -687,9 +689,14 @@ class FeatureManagement(commands.Cog, name="Feature Management"):
                             continue
                     more_features.append(name)
                 guild_db.feature_ids.extend(more_features)
-                guild_db = await session.merge(guild_db)
-                # refresh the cache after the merge
-                self.bot.guild_db[guild.id] = guild_db
+                writes.append(self.bot.db_writes.queue(guild_db, "feature_ids"))
+            self.bot.invalidate_guild_feature_sets()
+        await asyncio.gather(*writes)
+        if ctx_or_inter is not ctx:
+            # a feature was created
+            await self.bot.invalidation_bus.publish(InvalidationKind.FEATURES, feature_names[0])
+        for guild in guilds:
+            await self.bot.invalidation_bus.publish(InvalidationKind.GUILD, guild.id)
 
         button = DeleteButton(ctx_or_inter.author, allow_manage_messages=False, initial_message=ctx.message)
         if isinstance(ctx_or_inter, disnake.Interaction):
@@ -727,24 +734,27 @@ class FeatureManagement(commands.Cog, name="Feature Management"):
             )
 
         guild_dbs: list[Guild] = []
-        async with self.bot.db.begin() as session:
-            for guild in guilds:
-                guild_db = await self.bot.ensure_guild(guild.id)
-                guild_dbs.append(guild_db)
-
-                remove_features = []
-                for name in feature_names:
-                    if name not in guild_db.feature_ids:
-                        if len(guilds) == 1:
-                            msg = f"That feature is not enabled in guild ID `{guild.id}`."
-                            raise commands.UserInputError(msg)
-                        else:
-                            continue
-                    remove_features.append(name)
-                for feature in remove_features:
-                    guild_db.feature_ids.remove(feature)
-                guild_db = await session.merge(guild_db)
-            await session.commit()
+        writes: list[asyncio.Future[None]] = []
+        for guild in guilds:
+            guild_db = await self.bot.ensure_guild(guild.id)
+            guild_dbs.append(guild_db)
+
+            remove_features = []
+            for name in feature_names:
+                if name not in guild_db.feature_ids:
+                    if len(guilds) == 1:
+                        msg = f"That feature is not enabled in guild ID `{guild.id}`."
+                        raise commands.UserInputError(msg)
+                    else:
+                        continue
+                remove_features.append(name)
+            for feature in remove_features:
+                guild_db.feature_ids.remove(feature)
+            writes.append(self.bot.db_writes.queue(guild_db, "feature_ids"))
+        self.bot.invalidate_guild_feature_sets()
+        await asyncio.gather(*writes)
+        for guild in guilds:
+            await self.bot.invalidation_bus.publish(InvalidationKind.GUILD, guild.id)
 
         button = DeleteButton(ctx.author, allow_manage_messages=False, initial_message=ctx.message)
         await ctx.reply(
@@ -826,16 +836,16 @@ class FeatureManagement(commands.Cog, name="Feature Management"):
             guild, feature.name, include_feature_status=False, create_if_not_exists=False
         )
 
-        async with self.bot.db.begin() as session:
-            guild_db = await self.bot.ensure_guild(guild.id)
-            if not guild_has_feature:
-                if feature.name not in guild_db.feature_ids:
-                    guild_db.feature_ids.append(feature.name)
-            elif feature.name in guild_db.feature_ids:
-                guild_db.feature_ids.remove(feature.name)
-            guild_db = await session.merge(guild_db)
-            self.bot.guild_db[guild.id] = guild_db
-            await session.commit()
+        guild_db = await self.bot.ensure_guild(guild.id)
+        if not guild_has_feature:
+            if feature.name not in guild_db.feature_ids:
+                guild_db.feature_ids.append(feature.name)
+        elif feature.name in guild_db.feature_ids:
+            guild_db.feature_ids.remove(feature.name)
+        self.bot.invalidation_bus.publish_after(
+            self.bot.db_writes.queue(guild_db, "feature_ids"), InvalidationKind.GUILD, guild.id
+        )
+        self.bot.invalidate_guild_feature_sets()
 
         await self.show_feature(
             inter,
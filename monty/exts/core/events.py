@@ -19,6 +19,16 @@ class Events(commands.Cog):
     def __init__(self, bot: Monty) -> None:
         self.bot = bot
 
+    @commands.Cog.listener(disnake.Event.ready)
+    async def on_ready(self) -> None:
+        """Preload the database rows of every guild the bot is in."""
+        self.bot.queue_guild_preload(guild.id for guild in self.bot.guilds)
+
+    @commands.Cog.listener(disnake.Event.guild_available)
+    async def on_guild_available(self, guild: disnake.Guild) -> None:
+        """Preload the database rows of guilds as they are received from the gateway."""
+        self.bot.queue_guild_preload((guild.id,))
+
     @commands.Cog.listener(disnake.Event.message)
     async def on_message(self, message: disnake.Message) -> None:
         """Re-dispatch message listener events for on_message commands.
@@ -14,6 +14,7 @@ from monty.log import get_logger
 from monty.metadata import ExtMetadata
 from monty.utils import rollouts, scheduling
 from monty.utils.helpers import utcnow
+from monty.utils.invalidation import InvalidationKind
 from monty.utils.messages import DeleteButton
 
 
@@ -55,6 +56,9 @@ class RolloutCog(commands.Cog, name="Rollouts"):
     @tasks.loop(minutes=15)
     async def update_rollout_counts(self) -> None:
         """Update rollout levels every 15 minutes if a rollout is being updated."""
+        if not await self.bot.singleton.wait_until_elected():
+            # another process updates the rollouts, and tells this one to refresh its features
+            return
         logger.debug("Starting rollout levels update task.")
         now = datetime.now(tz=timezone.utc)
         async with self.bot.db.begin() as session:
@@ -71,7 +75,12 @@ class RolloutCog(commands.Cog, name="Rollouts"):
                 rollout.hashes_last_updated = now
             await session.commit()
 
+        await self.refresh_features()
+
+    async def refresh_features(self) -> None:
+        """Refresh the cached features and rollouts, and have every other bot process do the same."""
         await self.bot.refresh_features()
+        await self.bot.invalidation_bus.publish(InvalidationKind.FEATURES)
 
     async def wait_for_confirmation(
         self,
@@ -223,7 +232,7 @@ class RolloutCog(commands.Cog, name="Rollouts"):
             await session.commit()
         assert rollouts.compute_current_percent(rollout) * 100 == new_percent
         await ctx.send(f"Succesfully changed the current rollout percent to `{new_percent:6.3f}%`.")
-        scheduling.create_task(self.bot.refresh_features())
+        scheduling.create_task(self.refresh_features())
 
     @cmd_rollouts.command("delete")
     async def cmd_rollouts_delete(self, ctx: commands.Context, rollout: RolloutConverter) -> None:
@@ -263,7 +272,7 @@ class RolloutCog(commands.Cog, name="Rollouts"):
                 return
 
         await ctx.send(content=f"Rollout `{rollout.name}` successfully deleted.", components=button)
-        scheduling.create_task(self.bot.refresh_features())
+        scheduling.create_task(self.refresh_features())
 
     @cmd_rollouts.command("start")
     async def cmd_rollouts_start(self, ctx: commands.Context, rollout: RolloutConverter, dt: ArrowConverter) -> None:
@@ -344,6 +353,7 @@ class RolloutCog(commands.Cog, name="Rollouts"):
                 feature = await session.merge(feature)
                 await session.commit()
                 self.bot.features[feature.name] = feature
+                self.bot.invalidate_guild_feature_sets()
             msg = f"Feature `{feature.name}` successfully linked to rollout `{rollout.name}`."
 
         else:
@@ -359,11 +369,13 @@ class RolloutCog(commands.Cog, name="Rollouts"):
                 result = await session.scalars(stmt)
                 feature = result.one()
                 await session.commit()
+                self.bot.features[feature.name] = feature
+                self.bot.invalidate_guild_feature_sets()
             msg = f"Feature `{feature.name}` successfully unlinked from rollout `{rollout.name}`."
 
         button = DeleteButton(ctx.author, allow_manage_messages=False, initial_message=ctx.message)
         await ctx.send(msg, components=button)
-        scheduling.create_task(self.bot.refresh_features())
+        scheduling.create_task(self.refresh_features())
 
     async def cog_check(self, ctx: commands.Context) -> bool:
         """Require all commands in this cog are by the bot author and are in guilds."""
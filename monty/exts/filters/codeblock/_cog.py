@@ -6,10 +6,11 @@ from disnake.ext import commands
 
 from monty import constants
 from monty.bot import Monty
+from monty.events import MessageContext, MontyEvent
 from monty.exts.filters.codeblock._instructions import get_instructions
 from monty.exts.filters.codeblock._parsing import is_python_code
 from monty.exts.filters.token_remover import TokenRemover
-from monty.exts.filters.webhook_remover import WEBHOOK_URL_RE
+from monty.exts.filters.webhook_remover import WEBHOOK_URL_EXTRACTOR
 from monty.log import get_logger
 from monty.utils import scheduling
 from monty.utils.helpers import has_lines
@@ -125,8 +126,8 @@ class CodeBlockCog(
         log.trace(f"Checking if #{channel} qualifies for code block detection.")
         if not isinstance(channel, GuildMessageable):
             return False
-        return channel.guild and await self.bot.guild_has_feature(
-            channel.guild, constants.Feature.CODEBLOCK_RECOMMENDATIONS
+        return bool(channel.guild) and (
+            constants.Feature.CODEBLOCK_RECOMMENDATIONS.value in await self.bot.get_guild_feature_set(channel.guild.id)
         )
 
     async def send_instructions(self, message: disnake.Message, instructions: str) -> None:
@@ -148,7 +149,7 @@ class CodeBlockCog(
 
         scheduling.create_task(add_task(), event_loop=self.bot.loop)
 
-    async def should_parse(self, message: disnake.Message) -> bool:
+    async def should_parse(self, message: disnake.Message, context: MessageContext) -> bool:
         """
         Return True if `message` should be parsed.
 
@@ -163,12 +164,12 @@ class CodeBlockCog(
             not message.author.bot
             and await self.is_valid_channel(message.channel)
             and has_lines(message.content, constants.CodeBlock.minimum_lines)
-            and not TokenRemover.find_token_in_message(message)
-            and not WEBHOOK_URL_RE.search(message.content)
+            and not TokenRemover.find_token_in_message(context)
+            and not context.extract(WEBHOOK_URL_EXTRACTOR)
         )
 
-    @commands.Cog.listener()
-    async def on_message(self, msg: disnake.Message) -> None:
+    @commands.Cog.listener("on_" + MontyEvent.monty_message_processed.value)
+    async def on_message(self, msg: disnake.Message, context: MessageContext) -> None:
         """Detect incorrect Markdown code blocks in `msg` and send instructions to fix them."""
         # check for perms first
         if not msg.guild:
@@ -180,7 +181,7 @@ class CodeBlockCog(
         ):
             return
 
-        if not await self.should_parse(msg):
+        if not await self.should_parse(msg, context):
             log.trace(f"Skipping code block detection of {msg.id}: message doesn't qualify.")
             return
 
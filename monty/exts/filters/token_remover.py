@@ -12,6 +12,7 @@ from disnake.ext import commands
 
 from monty import constants, utils
 from monty.bot import Monty
+from monty.events import MessageContext, MessageExtractor, MontyEvent
 from monty.log import get_logger
 from monty.utils.services import GITHUB_REQUEST_HEADERS
 
@@ -51,6 +52,13 @@ TOKEN_RE = re.compile(r"([a-z0-9_-]{23,28})\.([a-z0-9_-]{6,7})\.([a-z0-9_-]{27,}
 # because its not possible.
 MFA_TOKEN_RE = re.compile(r"(mfa\.[a-z0-9_-]{20,})", re.IGNORECASE)
 
+# Tokens have no literal part to use as a trigger besides their dots, which are in nearly every message,
+# so the pattern is always run.
+TOKEN_EXTRACTOR = MessageContext.register_extractor(MessageExtractor("discord_tokens", TOKEN_RE))
+MFA_TOKEN_EXTRACTOR = MessageContext.register_extractor(
+    MessageExtractor("discord_mfa_tokens", MFA_TOKEN_RE, trigger="mfa.")
+)
+
 
 @attr.s(kw_only=False, auto_attribs=True)
 class Token:
@@ -92,8 +100,8 @@ class TokenRemover(commands.Cog, name="Token Remover"):
         await msg.delete()
         return True
 
-    @commands.Cog.listener()
-    async def on_message(self, msg: disnake.Message) -> None:
+    @commands.Cog.listener("on_" + MontyEvent.monty_message_processed.value)
+    async def on_message(self, msg: disnake.Message, context: MessageContext) -> None:
         """
         Check each message for a string that matches Discord's token pattern.
 
@@ -103,10 +111,13 @@ class TokenRemover(commands.Cog, name="Token Remover"):
         if not msg.guild:
             return
 
-        if not await self.bot.guild_has_feature(msg.guild, constants.Feature.DISCORD_TOKEN_REMOVER):
+        if not context.extract(TOKEN_EXTRACTOR) and not context.extract(MFA_TOKEN_EXTRACTOR):
             return
 
-        found_tokens = self.find_token_in_message(msg)
+        if constants.Feature.DISCORD_TOKEN_REMOVER.value not in await self.bot.get_guild_feature_set(msg.guild.id):
+            return
+
+        found_tokens = self.find_token_in_message(context)
         if found_tokens:
             # now check if the token is valid
             ids = await self.check_valid(*found_tokens)
@@ -119,7 +130,13 @@ class TokenRemover(commands.Cog, name="Token Remover"):
             await self.take_action(msg, found_tokens)
 
         # check for mfa tokens
-        await self.handle_mfa_token(msg)
+        await self.handle_mfa_token(msg, context)
+
+    @commands.Cog.listener("on_message")
+    async def on_bot_message(self, msg: disnake.Message) -> None:
+        """Check messages from bots, which are not dispatched with a processed message context."""
+        if msg.author.bot:
+            await self.on_message(msg, MessageContext.from_message(msg))
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: disnake.Message, after: disnake.Message) -> None:
@@ -131,11 +148,11 @@ class TokenRemover(commands.Cog, name="Token Remover"):
         if before.content == after.content:
             return
 
-        if self.find_token_in_message(before):
+        if self.find_token_in_message(MessageContext.from_message(before)):
             # already alerted the user, no need to alert again
             return
 
-        await self.on_message(after)
+        await self.on_message(after, MessageContext.from_message(after))
 
     async def check_valid(self, *tokens: Token) -> list[int | None]:
         """Check if the provided tokens were valid or not."""
@@ -186,7 +203,7 @@ class TokenRemover(commands.Cog, name="Token Remover"):
             log_message = self.format_log_message(msg, token)
             log.debug(log_message)
 
-    async def handle_mfa_token(self, msg: disnake.Message) -> None:
+    async def handle_mfa_token(self, msg: disnake.Message, context: MessageContext) -> None:
         """
         Check all messages for a string that matches the mfa token pattern.
 
@@ -198,7 +215,7 @@ class TokenRemover(commands.Cog, name="Token Remover"):
 
         was_valid = False
         match = None
-        for match in MFA_TOKEN_RE.finditer(msg.content):
+        for match in context.extract(MFA_TOKEN_EXTRACTOR):
             if self.is_maybe_valid_hmac(match.group()):
                 was_valid = True
                 break
@@ -229,10 +246,10 @@ class TokenRemover(commands.Cog, name="Token Remover"):
         )
 
     @classmethod
-    def find_token_in_message(cls, msg: disnake.Message) -> list[Token] | None:
-        """Return a seemingly valid token found in `msg` or `None` if no token is found."""
+    def find_token_in_message(cls, context: MessageContext) -> list[Token] | None:
+        """Return a seemingly valid token found in the message `context` or `None` if no token is found."""
         tokens = []
-        for match in TOKEN_RE.finditer(msg.content):
+        for match in context.extract(TOKEN_EXTRACTOR):
             token = Token(*match.groups())
             if (
                 (cls.extract_user_id(token.user_id) is not None)
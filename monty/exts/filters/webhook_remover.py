@@ -5,12 +5,16 @@ from disnake.ext import commands
 
 from monty.bot import Monty
 from monty.constants import Feature
+from monty.events import MessageContext, MessageExtractor, MontyEvent
 from monty.log import get_logger
 
 
 WEBHOOK_URL_RE = re.compile(
     r"((?:https?:\/\/)?(?:ptb\.|canary\.)?discord(?:app)?\.com\/api\/webhooks\/\d+\/)\S+\/?", re.IGNORECASE
 )
+WEBHOOK_URL_EXTRACTOR = MessageContext.register_extractor(
+    MessageExtractor("discord_webhooks", WEBHOOK_URL_RE, trigger="/api/webhooks/")
+)
 
 ALERT_MESSAGE_TEMPLATE = (
     "{user}, looks like you posted a Discord webhook URL. Therefore "
@@ -57,21 +61,25 @@ class WebhookRemover(commands.Cog, name="Webhook Remover"):
         )
         log.debug(message)
 
-    @commands.Cog.listener()
-    async def on_message(self, msg: disnake.Message) -> None:
+    @commands.Cog.listener("on_" + MontyEvent.monty_message_processed.value)
+    async def on_message(self, msg: disnake.Message, context: MessageContext) -> None:
         """Check if a Discord webhook URL is in `message`."""
         # Ignore DMs; can't delete messages in there anyway.
         if not msg.guild or msg.author.bot:
             return
-        if not await self.bot.guild_has_feature(msg.guild, Feature.DISCORD_WEBHOOK_REMOVER):
+
+        extracted = context.extract(WEBHOOK_URL_EXTRACTOR)
+        if not extracted:
+            return
+
+        if Feature.DISCORD_WEBHOOK_REMOVER.value not in await self.bot.get_guild_feature_set(msg.guild.id):
             return
 
-        matches = WEBHOOK_URL_RE.search(msg.content)
-        if matches:
-            async with self.bot.http_session.delete(matches[0]) as resp:
-                # The Discord API Returns a 204 NO CONTENT response on success.
-                deleted_successfully = resp.status == 204
-            await self.delete_and_respond(msg, matches[1] + "xxx", webhook_deleted=deleted_successfully)
+        matches = extracted[0]
+        async with self.bot.http_session.delete(matches[0]) as resp:
+            # The Discord API Returns a 204 NO CONTENT response on success.
+            deleted_successfully = resp.status == 204
+        await self.delete_and_respond(msg, matches[1] + "xxx", webhook_deleted=deleted_successfully)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: disnake.Message, after: disnake.Message) -> None:
@@ -79,7 +87,7 @@ class WebhookRemover(commands.Cog, name="Webhook Remover"):
         if before.content == after.content:
             return
 
-        await self.on_message(after)
+        await self.on_message(after, MessageContext.from_message(after))
 
 
 def setup(bot: Monty) -> None:
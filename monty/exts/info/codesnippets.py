@@ -1,6 +1,9 @@
+import asyncio
+import dataclasses
 import logging
 import re
 import textwrap
+import time
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any, overload
 from urllib.parse import quote_plus
@@ -17,9 +20,11 @@ from monty.bot import Monty
 from monty.events import MessageContext, MontyEvent
 from monty.log import get_logger
 from monty.utils import scheduling
+from monty.utils.caching import RedisCache
 from monty.utils.helpers import EXPAND_BUTTON_PREFIX, block_url_traversal, decode_github_link
 from monty.utils.markdown import remove_codeblocks
 from monty.utils.messages import DeleteButton, suppress_embeds
+from monty.utils.services import GITHUB_REQUEST_HEADERS
 
 
 if TYPE_CHECKING:
@@ -56,12 +61,65 @@ BITBUCKET_RE = re.compile(
     r"/(?P<file_path>[^#>]+)(\?[^#>]+)?(#lines-(?P<start_line>\d+)(:(?P<end_line>\d+))?)"
 )
 
+# Files at a commit never change, so their contents can be cached for a long time.
+# Refs can move at any moment, so their resolved commits are only kept briefly.
+BLOB_CACHE_TIMEOUT = timedelta(days=7)
+REF_CACHE_TIMEOUT = timedelta(minutes=5)
+# Files larger than this many bytes are not stored in the blob cache.
+MAX_CACHED_BLOB_SIZE = 512 * 1024
+
+# Files are streamed only up to the last requested line, and never past this many bytes
+MAX_SNIPPET_FILE_SIZE = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Ref indexes older than this are still used, but are refreshed in the background
+REF_INDEX_REFRESH_AFTER = timedelta(minutes=10)
+# Number of repositories to keep ref indexes for
+MAX_REF_INDEXES = 256
+# Upper bound on the number of pages of branches or tags fetched for one repository, at 100 refs per page
+MAX_REF_PAGES = 50
+
+# A full or abbreviated commit sha, as the first segment of a snippet path
+COMMIT_SHA_RE = re.compile(r"[0-9a-f]{7,64}", re.IGNORECASE)
+FULL_COMMIT_SHA_RE = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}", re.IGNORECASE)
+
+# Maximum number of snippets fetched at the same time for a single message
+MAX_CONCURRENT_FETCHES = 4
+# Seconds to wait for all of the snippets in a message before sending what has been fetched
+SNIPPET_FETCH_DEADLINE = 10
+
 # map specific file extensions to different syntax-highlighting languages
 LANGUAGE_MAPPING: dict[str, str] = {
     "pyi": "py",
 }
 
 
+@dataclasses.dataclass
+class RefIndex:
+    """All branch and tag names of a repository, mapped to the commit they point to, if known."""
+
+    refs: dict[str, str | None]
+    created_at: float = dataclasses.field(default_factory=time.monotonic)
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether this index should be refreshed."""
+        return time.monotonic() - self.created_at > REF_INDEX_REFRESH_AFTER.total_seconds()
+
+    def split_path(self, path: str) -> tuple[str, str]:
+        """
+        Split `path` into the longest ref it starts with and the remaining file path.
+
+        If no known ref matches, the first segment of the path is assumed to be the ref.
+        """
+        end = len(path)
+        while (end := path.rfind("/", 0, end)) > 0:
+            if path[:end] in self.refs:
+                return path[:end], path[end + 1 :]
+        ref, file_path = path.split("/", 1)
+        return ref, file_path
+
+
 class CodeSnippets(commands.Cog, name="Code Snippets"):
     """
     commands.Cog that parses and sends code snippets to disnake.
@@ -83,6 +141,16 @@ class CodeSnippets(commands.Cog, name="Code Snippets"):
         self.request_cache: cachingutils.MemoryCache[tuple[str, str], Any] = cachingutils.MemoryCache(
             timeout=timedelta(minutes=6)
         )
+        # (owner/repo, commit sha, file path) -> file contents
+        self.blob_cache = RedisCache("codesnippets:github-blobs", timeout=BLOB_CACHE_TIMEOUT)
+        # (owner/repo, ref and path) -> (commit sha, file path)
+        self.ref_cache = RedisCache("codesnippets:github-refs", timeout=REF_CACHE_TIMEOUT)
+
+        # (host, repo) -> ref index, along with any in-progress builds of them
+        self.ref_indexes: cachingutils.LRUMemoryCache[tuple[str, str], RefIndex] = cachingutils.LRUMemoryCache(
+            MAX_REF_INDEXES, timeout=int(timedelta(days=1).total_seconds())
+        )
+        self._ref_index_builds: dict[tuple[str, str], asyncio.Task[RefIndex]] = {}
 
     async def _fetch_response(self, url: str, response_format: str, **kwargs) -> Any:
         """Makes http requests using aiohttp."""
@@ -101,22 +169,168 @@ class CodeSnippets(commands.Cog, name="Code Snippets"):
         self.request_cache.set(key, body)
         return body
 
-    def _find_ref(self, path: str, refs: list) -> tuple:
-        """Loops through all branches and tags to find the required ref."""
-        # Base case: there is no slash in the branch name
-        ref, file_path = path.split("/", 1)
-        # In case there are slashes in the branch name, we loop through all branches and tags
-        for possible_ref in refs:
-            if path.startswith(possible_ref["name"] + "/"):
-                ref = possible_ref["name"]
-                file_path = path[len(ref) + 1 :]
-                break
+    async def _fetch_lines(self, url: str | yarl.URL, last_line: int, **kwargs) -> tuple[str, bool]:
+        """
+        Stream a raw file, returning its contents up to and including `last_line`, and whether it was read in full.
+
+        Reading stops as soon as the last requested line has been received, so large files are never fully buffered.
+        Files are also cut off after `MAX_SNIPPET_FILE_SIZE` bytes, at the last complete line.
+        """
+        key = (str(url), f"lines:{last_line}")
+        if cached := self.request_cache.get(key):
+            return cached
+
+        buffer = bytearray()
+        newlines = 0
+        complete = True
+        async with (
+            self.bot.http_session.disabled(),
+            self.bot.http_session.get(url, raise_for_status=True, **kwargs) as response,
+        ):
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                buffer += chunk
+                newlines += chunk.count(b"\n")
+                if newlines >= last_line:
+                    # drop everything after the last requested line
+                    buffer = b"\n".join(buffer.split(b"\n", last_line)[:last_line])
+                    complete = False
+                    break
+                if len(buffer) >= MAX_SNIPPET_FILE_SIZE:
+                    del buffer[buffer.rfind(b"\n") + 1 :]
+                    complete = False
+                    break
+
+        result = (buffer.decode("utf-8", errors="replace"), complete)
+        self.request_cache.set(key, result)
+        return result
+
+    def _find_ref(self, path: str, index: RefIndex) -> tuple[str, str]:
+        """Find the longest branch or tag the path starts with, as branch names may contain slashes."""
+        ref, file_path = index.split_path(path)
 
         # remove the query parameters from the file path
         file_path = file_path.rsplit("?", 1)[0]
 
         return ref, file_path
 
+    async def _get_ref_index(self, key: tuple[str, str], builder: "Callable[[], Awaitable[RefIndex]]") -> RefIndex:
+        """
+        Get the ref index for the repository identified by `key`, building it with `builder` if needed.
+
+        Stale indexes are returned immediately and refreshed in the background.
+        """
+        index = self.ref_indexes.get(key)
+        if index is None:
+            # shielded so a cancelled caller doesn't cancel the build shared with other callers
+            return await asyncio.shield(self._build_ref_index(key, builder))
+
+        if index.is_stale and key not in self._ref_index_builds:
+            self._build_ref_index(key, builder)
+        return index
+
+    def _build_ref_index(
+        self, key: tuple[str, str], builder: "Callable[[], Awaitable[RefIndex]]"
+    ) -> asyncio.Task[RefIndex]:
+        """Build and store the ref index for `key`, sharing the build between concurrent callers."""
+        if task := self._ref_index_builds.get(key):
+            return task
+
+        async def build() -> RefIndex:
+            try:
+                index = await builder()
+                self.ref_indexes.set(key, index)
+                return index
+            finally:
+                del self._ref_index_builds[key]
+
+        task = self._ref_index_builds[key] = scheduling.create_task(build(), name=f"ref index {key[0]}:{key[1]}")
+        return task
+
+    async def _fetch_github_ref_index(self, user: str, repo: str) -> RefIndex:
+        """Fetch every branch and tag of a GitHub repository."""
+
+        async def fetch_all(endpoint: "Callable[..., Awaitable[Any]]") -> list[dict[str, Any]]:
+            refs: list[dict[str, Any]] = []
+            for page in range(1, MAX_REF_PAGES + 1):
+                r = await endpoint(user, repo, per_page=100, page=page)
+                data = r.json()
+                refs.extend(data)
+                if len(data) < 100:
+                    break
+            else:
+                log.warning(f"Stopped listing refs of {user}/{repo} after {MAX_REF_PAGES} pages.")
+            return refs
+
+        branches, tags = await asyncio.gather(
+            fetch_all(self.bot.github.rest.repos.async_list_branches),
+            fetch_all(self.bot.github.rest.repos.async_list_tags),
+        )
+        return RefIndex({ref["name"]: ref["commit"]["sha"] for ref in branches + tags})
+
+    async def _fetch_gitlab_ref_index(self, repo: str) -> RefIndex:
+        """Fetch every branch and tag of a GitLab project."""
+
+        async def fetch_all(url: str) -> list[dict[str, Any]]:
+            refs: list[dict[str, Any]] = []
+            for page in range(1, MAX_REF_PAGES + 1):
+                data = await self._fetch_response(f"{url}?per_page=100&page={page}", "json")
+                refs.extend(data)
+                if len(data) < 100:
+                    break
+            else:
+                log.warning(f"Stopped listing refs of {repo} after {MAX_REF_PAGES} pages.")
+            return refs
+
+        branches, tags = await asyncio.gather(
+            fetch_all(f"https://gitlab.com/api/v4/projects/{repo}/repository/branches"),
+            fetch_all(f"https://gitlab.com/api/v4/projects/{repo}/repository/tags"),
+        )
+        return RefIndex({ref["name"]: ref["commit"]["id"] for ref in branches + tags})
+
+    async def _resolve_github_ref(self, user: str, repo: str, path: str) -> tuple[str, str]:
+        """
+        Resolve the ref at the start of `path` to a commit sha, returning the sha and the remaining file path.
+
+        Resolutions are briefly cached, as the same link is often posted many times in a short period.
+        """
+        repo_name = f"{user.casefold()}/{repo.casefold()}"
+        ref_key = f"{repo_name}:{path}"
+        if cached := await self.ref_cache.get(ref_key):
+            return cached
+
+        sha: str | None = None
+        first_segment, encoded_file_path = path.split("/", 1)
+        encoded_file_path = encoded_file_path.rsplit("?", 1)[0]
+        if FULL_COMMIT_SHA_RE.fullmatch(first_segment):
+            # links to a specific commit don't need any lookups
+            sha = first_segment.lower()
+        elif COMMIT_SHA_RE.fullmatch(first_segment):
+            # this is most likely an abbreviated commit, which isn't listed in the ref index
+            try:
+                r = await self.bot.github.rest.repos.async_get_commit(
+                    user, repo, first_segment, headers={"Accept": "application/vnd.github.sha"}
+                )
+            except githubkit.exception.RequestFailed as e:
+                if e.response.status_code not in (404, 422):
+                    raise
+            else:
+                sha = r.text.strip()
+
+        if sha is None:
+            index = await self._get_ref_index(("github", repo_name), lambda: self._fetch_github_ref_index(user, repo))
+            ref, encoded_file_path = self._find_ref(path, index)
+            sha = index.refs.get(ref)
+
+            if sha is None:
+                # the ref was not listed, ask GitHub which commit it points to
+                r = await self.bot.github.rest.repos.async_get_commit(
+                    user, repo, ref, headers={"Accept": "application/vnd.github.sha"}
+                )
+                sha = r.text.strip()
+
+        await self.ref_cache.set(ref_key, (sha, encoded_file_path))
+        return sha, encoded_file_path
+
     async def _fetch_github_snippet(
         self,
         *,
@@ -132,22 +346,23 @@ class CodeSnippets(commands.Cog, name="Code Snippets"):
         if end_line:
             end_line = block_url_traversal(end_line)
 
-        # Search the GitHub API for the specified branch
-        r = await self.bot.github.rest.repos.async_list_branches(user, repo, per_page=100)
-        branches = r.json()
-        r = await self.bot.github.rest.repos.async_list_tags(user, repo, per_page=100)
-        tags = r.json()
-        refs = branches + tags
-        ref, encoded_file_path = self._find_ref(path, refs)
-
-        r = await self.bot.github.rest.repos.async_get_content(
-            user,
-            repo,
-            encoded_file_path,
-            ref=ref,
-            headers={"Accept": "application/vnd.github.v3.raw"},
-        )
-        file_contents = r.text
+        sha, encoded_file_path = await self._resolve_github_ref(user, repo, path)
+
+        # owner and repository names are case insensitive, but refs and paths are not
+        blob_key = f"{user.casefold()}/{repo.casefold()}:{sha}:{encoded_file_path}"
+        file_contents: str | None = await self.blob_cache.get(blob_key)
+        if file_contents is None:
+            url = yarl.URL(
+                f"https://api.github.com/repos/{user}/{repo}/contents/{encoded_file_path}", encoded=True
+            ).with_query(ref=sha)
+            file_contents, complete = await self._fetch_lines(
+                url,
+                self._last_line(start_line, end_line),
+                headers=GITHUB_REQUEST_HEADERS | {"Accept": "application/vnd.github.v3.raw"},
+            )
+            # only whole files can be cached, as other snippets may need later lines
+            if complete and len(file_contents.encode()) <= MAX_CACHED_BLOB_SIZE:
+                await self.blob_cache.set(blob_key, file_contents)
 
         # decode the file_path before calling snippet to codeblock
         file_path = urlunquote(encoded_file_path)
@@ -181,9 +396,9 @@ class CodeSnippets(commands.Cog, name="Code Snippets"):
         # Check each file in the gist for the specified file
         for gist_file in gist_json["files"]:
             if file_path == gist_file.lower().replace(".", "-"):
-                file_contents = await self._fetch_response(
+                file_contents, _ = await self._fetch_lines(
                     gist_json["files"][gist_file]["raw_url"],
-                    "text",
+                    self._last_line(start_line, end_line),
                 )
                 return self._snippet_to_codeblock(file_contents, gist_file, start_line, end_line)
         return ""
@@ -200,16 +415,14 @@ class CodeSnippets(commands.Cog, name="Code Snippets"):
         """Fetches a snippet from a GitLab repo."""
         repo, start_line, end_line = block_url_traversal(repo, start_line, end_line)
         # Searches the GitLab API for the specified branch
-        branches = await self._fetch_response(f"https://gitlab.com/api/v4/projects/{repo}/repository/branches", "json")
-        tags = await self._fetch_response(f"https://gitlab.com/api/v4/projects/{repo}/repository/tags", "json")
-        refs = branches + tags
-        ref, file_path = self._find_ref(path, refs)
+        index = await self._get_ref_index(("gitlab", repo.casefold()), lambda: self._fetch_gitlab_ref_index(repo))
+        ref, file_path = self._find_ref(path, index)
         ref = quote_plus(ref)
         path = quote_plus(file_path)
 
-        file_contents = await self._fetch_response(
+        file_contents, _ = await self._fetch_lines(
             f"https://gitlab.com/api/v4/projects/{repo}/repository/files/{path}/raw?ref={ref}",
-            "text",
+            self._last_line(start_line, end_line),
         )
         return self._snippet_to_codeblock(file_contents, file_path, start_line, end_line)
 
@@ -224,12 +437,17 @@ class CodeSnippets(commands.Cog, name="Code Snippets"):
         **kwargs: "NoReturn",
     ) -> str:
         """Fetches a snippet from a BitBucket repo."""
-        file_contents = await self._fetch_response(
+        file_contents, _ = await self._fetch_lines(
             f"https://bitbucket.org/{quote_plus(repo)}/raw/{quote_plus(ref)}/{quote_plus(file_path)}",
-            "text",
+            self._last_line(start_line, end_line),
         )
         return self._snippet_to_codeblock(file_contents, file_path, start_line, end_line)
 
+    @staticmethod
+    def _last_line(start_line: str | int, end_line: str | int | None) -> int:
+        """Return the last line of the file needed to show the requested range."""
+        return max(int(start_line), int(end_line or start_line))
+
     def _snippet_to_codeblock(
         self,
         file_contents: str,
@@ -238,7 +456,7 @@ class CodeSnippets(commands.Cog, name="Code Snippets"):
         end_line: str | int | None,
     ) -> str:
         """
-        Given the entire file contents and target lines, creates a code block.
+        Given the file contents, at least up to the last target line, and the target lines, creates a code block.
 
         First, we split the file contents into a list of lines and then keep and join only the required
         ones together.
@@ -323,35 +541,66 @@ class CodeSnippets(commands.Cog, name="Code Snippets"):
             msg = "Either content or context must be provided."
             raise ValueError(msg)
 
-        all_snippets: list[tuple[int, str]] = []
+        # normalised url -> (match index, handler, handler kwargs)
+        # identical links within one message are only fetched once
+        to_fetch: dict[str, tuple[int, Callable[..., Awaitable[str]], dict[str, Any]]] = {}
 
         for pattern, handler in self.pattern_handlers:
             for match in pattern.finditer(content):
+                start = match.start()
                 unsanitized = match.group(0)
                 normalised = str(yarl.URL(unsanitized))
                 if normalised != unsanitized:
                     match = pattern.fullmatch(normalised)
                     if not match:
                         continue
+                if normalised not in to_fetch:
+                    to_fetch[normalised] = (start, handler, match.groupdict())
+
+        if not to_fetch:
+            return ""
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def fetch_snippet(
+            url: str, handler: "Callable[..., Awaitable[str]]", kwargs: dict[str, Any]
+        ) -> str | None:
+            async with semaphore:
                 try:
-                    snippet = await handler(**match.groupdict())
-                    all_snippets.append((match.start(), snippet))
+                    return await handler(**kwargs)
                 except ClientResponseError as error:
                     error_message = error.message
                     log.log(
                         logging.DEBUG if error.status == 404 else logging.ERROR,
-                        f"Failed to fetch code snippet from {match[0]!r}: {error.status} "
+                        f"Failed to fetch code snippet from {url!r}: {error.status} "
                         f"{error_message} for GET {error.request_info.real_url.human_repr()}",
                     )
                 except githubkit.exception.RequestFailed as error:
                     log.log(
                         logging.ERROR if error.response.status_code != 404 else logging.DEBUG,
-                        f"Failed to fetch code snippet from {match[0]!r}: {error.response.status_code} "
+                        f"Failed to fetch code snippet from {url!r}: {error.response.status_code} "
                         f"{error.response.reason_phrase} for {error.request.method} {error.request.url}",
                     )
-
-        # Sorts the list of snippets by their match index and joins them into a single message
-        return "\n".join(m[1] for m in sorted(all_snippets))
+            return None
+
+        tasks = {
+            start: scheduling.create_task(fetch_snippet(url, handler, kwargs))
+            for url, (start, handler, kwargs) in to_fetch.items()
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=SNIPPET_FETCH_DEADLINE)
+        if pending:
+            log.warning(f"Timed out fetching {len(pending)} of {len(tasks)} code snippets.")
+            for task in pending:
+                task.cancel()
+
+        # Sorts the snippets by their match index and joins them into a single message
+        all_snippets: list[str] = []
+        for _, task in sorted(tasks.items()):
+            if not task.done() or task.cancelled() or task.exception() is not None:
+                continue
+            if (snippet := task.result()) is not None:
+                all_snippets.append(snippet)
+        return "\n".join(all_snippets)
 
     @commands.Cog.listener("on_" + MontyEvent.monty_message_processed.value)
     async def on_message(self, message: disnake.Message, context: MessageContext) -> None:
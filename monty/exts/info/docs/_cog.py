@@ -23,9 +23,11 @@ from monty import constants
 from monty.bot import Monty
 from monty.database import PackageInfo
 from monty.errors import MontyCommandError
+from monty.events import MessageContext, MessageExtractor, MontyEvent
 from monty.log import get_logger
 from monty.utils import scheduling
 from monty.utils.helpers import maybe_defer
+from monty.utils.invalidation import Invalidation, InvalidationKind
 from monty.utils.inventory_parser import InvalidHeaderError, InventoryDict, fetch_inventory
 from monty.utils.lock import SharedEvent, lock
 from monty.utils.messages import DeleteButton, DeleteView
@@ -62,6 +64,7 @@ FETCH_RESCHEDULE_DELAY = SimpleNamespace(first=2, repeated=5)
 COMMAND_LOCK_SINGLETON = "inventory refresh"
 
 DOCS_LINK_REGEX = re.compile(r"!`([\w.]+)`")
+DOCS_LINK_EXTRACTOR = MessageContext.register_extractor(MessageExtractor("inline_docs", DOCS_LINK_REGEX, trigger="!`"))
 CUSTOM_ID_PREFIX = "docs_"
 
 BLACKLIST: dict[int, set[str]] = {}
@@ -218,6 +221,9 @@ class DocCog(
         self.refresh_event.set()
         self.symbol_get_event = SharedEvent()
 
+        self.bot.invalidation_bus.subscribe(InvalidationKind.DOCS_INVENTORY, self._on_inventory_invalidated)
+        self.bot.invalidation_bus.subscribe(InvalidationKind.DOCS_WHITELIST, self._on_whitelist_invalidated)
+
     @lock(NAMESPACE, COMMAND_LOCK_SINGLETON, raise_error=True)
     async def cog_load(self) -> None:
         """Refresh inventories."""
@@ -436,6 +442,24 @@ class DocCog(
         else:
             return rename(item.group, rename_extant=True)
 
+    async def _on_inventory_invalidated(self, invalidation: Invalidation) -> None:
+        """Update the inventories after another process changed them."""
+        if invalidation.key is None:
+            await self.refresh_inventories()
+            return
+
+        async with self.bot.db.begin() as session:
+            stmt = sa.select(PackageInfo).where(PackageInfo.name == invalidation.key)
+            package = await session.scalar(stmt)
+        if package is None:
+            await self.refresh_inventories()
+        else:
+            await self.update_or_reschedule_inventory(package)
+
+    async def _on_whitelist_invalidated(self, invalidation: Invalidation) -> None:
+        """Refresh the whitelist after another process changed it."""
+        await self.refresh_whitelist_and_blacklist()
+
     async def refresh_whitelist_and_blacklist(self) -> None:
         """Refresh internal whitelist and blacklist."""
         self.whitelist.clear()
@@ -945,6 +969,7 @@ class DocCog(
         log.info(f"User @{ctx.author} ({ctx.author.id}) added a new documentation package:\n{package!r}")
 
         self.update_single(package, inventory_dict)
+        await self.bot.invalidation_bus.publish(InvalidationKind.DOCS_INVENTORY, package.name)
         await ctx.send(
             f"Added the package `{package.name}` to the database and updated the inventories.",
             components=components,
@@ -973,6 +998,7 @@ class DocCog(
 
             await self.refresh_inventories()
             await doc_cache.delete(package_name)
+            await self.bot.invalidation_bus.publish(InvalidationKind.DOCS_INVENTORY)
 
         await ctx.send(
             f"Successfully deleted `{package_name}` and refreshed the inventories.",
@@ -987,6 +1013,7 @@ class DocCog(
         old_inventories = set(self.base_urls)
         with ctx.typing():
             await self.refresh_inventories(use_cache=False)
+            await self.bot.invalidation_bus.publish(InvalidationKind.DOCS_INVENTORY)
         new_inventories = set(self.base_urls)
 
         if added := ", ".join(new_inventories - old_inventories):
@@ -1082,6 +1109,7 @@ class DocCog(
             await session.commit()
 
         await self.refresh_whitelist_and_blacklist()
+        await self.bot.invalidation_bus.publish(InvalidationKind.DOCS_WHITELIST)
 
         await ctx.send(
             f"Successfully whitelisted `{package_name}` in the following guilds:"
@@ -1129,6 +1157,7 @@ class DocCog(
             await session.commit()
 
         await self.refresh_whitelist_and_blacklist()
+        await self.bot.invalidation_bus.publish(InvalidationKind.DOCS_WHITELIST)
 
         await ctx.send(
             f"Successfully de-whitelisted `{package_name}` in the following guilds:"
@@ -1136,21 +1165,21 @@ class DocCog(
             components=components,
         )
 
-    @commands.Cog.listener()
-    async def on_message(self, message: disnake.Message) -> None:
+    @commands.Cog.listener("on_" + MontyEvent.monty_message_processed.value)
+    async def on_message(self, message: disnake.Message, context: MessageContext) -> None:
         """Echo docs if found and they match a regex."""
         if not message.guild:
             return
-        if message.author.bot:
-            return
 
-        if not await self.bot.guild_has_feature(message.guild, constants.Feature.INLINE_DOCS):
+        extracted = context.extract(DOCS_LINK_EXTRACTOR)
+        if not extracted:
             return
 
-        matches: list[str] = list(dict.fromkeys(list(DOCS_LINK_REGEX.findall(message.content))[:10], None))
-        if not matches:
+        if constants.Feature.INLINE_DOCS.value not in await self.bot.get_guild_feature_set(message.guild.id):
             return
 
+        matches: list[str] = list(dict.fromkeys([match[1] for match in extracted[:10]], None))
+
         tasks = [
             self._docs_get_command(
                 message,
@@ -1171,5 +1200,7 @@ class DocCog(
 
     def cog_unload(self) -> None:
         """Clear scheduled inventories, queued symbols and cleanup task on cog unload."""
+        self.bot.invalidation_bus.unsubscribe(InvalidationKind.DOCS_INVENTORY, self._on_inventory_invalidated)
+        self.bot.invalidation_bus.unsubscribe(InvalidationKind.DOCS_WHITELIST, self._on_whitelist_invalidated)
         self.inventory_scheduler.cancel_all()
         scheduling.create_task(self.item_fetcher.clear(), name="DocCog.item_fetcher unload clear")
@@ -3,10 +3,13 @@
 import dataclasses
 import datetime
 import enum
+import functools
 import re
 from abc import abstractmethod
+from collections.abc import Hashable
 from typing import Generic, Literal, NamedTuple, TypeVar, overload
 
+import cachingutils
 import disnake
 import disnake.utils
 import ghretos
@@ -24,6 +27,12 @@ from . import graphql_models
 T = TypeVar("T", bound=githubkit.GitHubModel)
 V = TypeVar("V", bound=ghretos.GitHubResource)
 
+# Rendered markdown bodies, keyed by the resource, when it was last updated, its body size, and the render options.
+# A body cannot change without bumping `updated_at`, so re-linking an unchanged resource skips markdown conversion.
+RENDERED_MARKDOWN_CACHE: cachingutils.LRUMemoryCache[tuple[Hashable, ...], str] = cachingutils.LRUMemoryCache(
+    512, timeout=int(datetime.timedelta(hours=1).total_seconds())
+)
+
 
 class VisualStyleState(NamedTuple):
     emoji: constants.AppEmojiAnn
@@ -120,6 +129,30 @@ def get_user_display_name(
     return user_string
 
 
+@functools.lru_cache(maxsize=128)
+def get_markdown_parser(repo_url: str) -> mistune.Markdown:
+    """Get a reusable markdown parser which renders to Discord markdown, linking issue references to `repo_url`."""
+    return mistune.create_markdown(
+        escape=False,
+        renderer=DiscordRenderer(repo=repo_url),
+        plugins=[
+            "strikethrough",
+            "task_lists",
+            "url",
+        ],
+    )
+
+
+def get_render_cache_key(obj: githubkit.GitHubModel) -> tuple[Hashable, ...] | None:
+    """Get a key identifying the current revision of a GitHub object's body, if it can be determined."""
+    html_url = getattr(obj, "html_url", None)
+    updated_at = getattr(obj, "updated_at", None)
+    body = getattr(obj, "body", None)
+    if not html_url or updated_at is None or body is None:
+        return None
+    return (html_url, updated_at, len(body))
+
+
 def get_user_html_url(
     user: githubkit.rest.SimpleUser | githubkit.rest.DiscussionPropUser | graphql_models.DiscussionCommentUser,
 ) -> str | None:
@@ -160,24 +193,29 @@ class GitHubRenderer(Generic[T, V]):
                 msg = f"Unsupported size: {size}"
                 raise ValueError(msg)
 
-    def render_markdown(self, body: str, *, repo_url: str, limit: int = 2700) -> str:
-        """Render GitHub Flavored Markdown to Discord flavoured markdown."""
-        markdown = mistune.create_markdown(
-            escape=False,
-            renderer=DiscordRenderer(repo=repo_url),
-            plugins=[
-                "strikethrough",
-                "task_lists",
-                "url",
-            ],
-        )
+    def render_markdown(
+        self, body: str, *, repo_url: str, limit: int = 2700, cache_key: tuple[Hashable, ...] | None = None
+    ) -> str:
+        """
+        Render GitHub Flavored Markdown to Discord flavoured markdown.
+
+        If a `cache_key` is provided, the rendered result is cached and reused for later renders with the same key.
+        """
+        if cache_key is not None:
+            cache_key = (*cache_key, repo_url, limit)
+            if (cached := RENDERED_MARKDOWN_CACHE.get(cache_key)) is not None:
+                return cached
+
+        markdown = get_markdown_parser(repo_url)
         body = markdown(body) or ""
 
         body = body.strip()
 
         if len(body) > limit:
-            return body[: limit - 3] + "..."
+            body = body[: limit - 3] + "..."
 
+        if cache_key is not None:
+            RENDERED_MARKDOWN_CACHE.set(cache_key, body)
         return body
 
     @abstractmethod
@@ -555,7 +593,12 @@ class NumberableRenderer(
             )
 
         if obj.body:
-            body = self.render_markdown(obj.body, repo_url=context.repo.html_url, limit=self._limit or 350)
+            body = self.render_markdown(
+                obj.body,
+                repo_url=context.repo.html_url,
+                limit=self._limit or 350,
+                cache_key=get_render_cache_key(obj),
+            )
             embed.description = body
         else:
             embed.description = "*No description provided.*"
@@ -590,7 +633,12 @@ class NumberableRenderer(
                 text_display_added = True
 
         if obj.body:
-            body = self.render_markdown(obj.body, repo_url=context.repo.html_url, limit=self._limit or 350)
+            body = self.render_markdown(
+                obj.body,
+                repo_url=context.repo.html_url,
+                limit=self._limit or 350,
+                cache_key=get_render_cache_key(obj),
+            )
             text_display.content += f"\n{body}\n"
 
         text_display.content += (
@@ -681,7 +729,9 @@ class IssueCommentRenderer(
             )
 
         if obj.body:
-            body = self.render_markdown(obj.body, repo_url=context.repo.html_url, limit=350)
+            body = self.render_markdown(
+                obj.body, repo_url=context.repo.html_url, limit=350, cache_key=get_render_cache_key(obj)
+            )
             embed.description = body
         else:
             embed.description = "*No description provided.*"
@@ -6,8 +6,8 @@ import operator
 import pathlib
 import random
 import re
-from collections.abc import Mapping
-from typing import Any, TypedDict
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, NamedTuple, TypedDict
 
 import cachingutils
 import disnake
@@ -48,14 +48,67 @@ EXPAND_ISSUE_CUSTOM_ID_REGEX = re.compile(
 
 repo_name_number_getter = operator.attrgetter("repo.owner", "repo.name", "number")
 
+# Fast-reject scans run before handing anything to ghretos.
+# Every shorthand form that can be matched without a bare username contains one of these characters,
+# and every url ghretos can parse points at github.com.
+SHORTHAND_CANDIDATE_REGEX = re.compile(r"[#@/]")
+GITHUB_URL_CANDIDATE_REGEX = re.compile(r"github\.com", re.IGNORECASE)
+
 log = get_logger(__name__)
 
 
+def parse_shorthand_segments(
+    text: str, settings: ghretos.MatcherSettings, *, prefilter: bool = True
+) -> Iterator[ghretos.GitHubResource]:
+    """
+    Yield the resources referenced with shorthand in the text, before their repositories are resolved.
+
+    Segments which cannot be shorthand are skipped without parsing them, unless `prefilter` is False.
+    """
+    # bare usernames have no marker characters, so only prefilter segments when those can't match
+    prefilter = prefilter and not settings.short_bare_username
+    if prefilter and not SHORTHAND_CANDIDATE_REGEX.search(text):
+        return
+    for segment in text.split():
+        if prefilter and not SHORTHAND_CANDIDATE_REGEX.search(segment):
+            continue
+        match = ghretos.parse_shorthand(
+            segment,
+            allow_optional_user=True,
+            settings=settings,
+        )
+        if match is not None:
+            yield match
+
+
+def parse_github_urls(
+    urls: Iterable[str], settings: ghretos.MatcherSettings, *, prefilter: bool = True
+) -> Iterator[ghretos.GitHubResource]:
+    """Yield the resources linked by the urls, skipping urls which aren't on GitHub unless `prefilter` is False."""
+    for url in urls:
+        if prefilter and not GITHUB_URL_CANDIDATE_REGEX.search(url):
+            continue
+        match = ghretos.parse_url(
+            url,
+            settings=settings,
+        )
+        if match is not None:
+            yield match
+
+
 class GitHubShorthandAliases(TypedDict, total=False):
     owner: Required[str]
     repo: Required[str]
 
 
+class AutolinkReply(NamedTuple):
+    """A sent autolink reply, with the matches it was rendered from and the models fetched for them."""
+
+    message: disnake.Message
+    matches: dict[ghretos.GitHubResource, github_handlers.InfoSize]
+    fetched: dict[ghretos.GitHubResource, githubkit.GitHubModel]
+
+
 @runtime_checkable
 class ImplementsRepository(Protocol):
     """Protocol for GitHub models that implement a repository."""
@@ -86,9 +139,7 @@ class GithubInfo(
             for repo, value in self.short_repos.items()
         ), "Repository shorthand keys must be casefolded and include exactly one `/` in the data file."
 
-        self.autolink_cache: cachingutils.MemoryCache[
-            int, tuple[disnake.Message, dict[ghretos.GitHubResource, github_handlers.InfoSize]]
-        ] = cachingutils.MemoryCache(timeout=600)
+        self.autolink_cache: cachingutils.MemoryCache[int, AutolinkReply] = cachingutils.MemoryCache(timeout=600)
 
     async def cog_load(self) -> None:
         """Sync the ratelimit cache upon cog load."""
@@ -182,30 +233,47 @@ class GithubInfo(
         *,
         limit: int | None = None,
         settings: ghretos.MatcherSettings | None = None,
+        fetched: dict[ghretos.GitHubResource, githubkit.GitHubModel] | None = None,
     ) -> dict[str, Any]:
-        """Get embeds for a list of GitHub resources."""
+        """
+        Get embeds for a list of GitHub resources.
+
+        If `fetched` is provided, resources already within it are not fetched again,
+        and every newly fetched resource is added to it.
+        """
         embeds: list[disnake.Embed] = []
         tiny_content: list[str] = []
 
-        coros = []
-        for match in resources:
-            # premptively check supported types:
-            handler = github_handlers.HANDLER_MAPPING.get(type(match))
-            if handler is None:
-                # append a useless coro to keep the order correct
-                coros.append(asyncio.sleep(0))
-                continue
-            coros.append(self.fetch_resource(match))
+        # premptively check supported types, and skip anything we already have
+        to_fetch = [
+            match
+            for match in resources
+            if github_handlers.HANDLER_MAPPING.get(type(match)) is not None
+            and (fetched is None or match not in fetched)
+        ]
 
         # TODO: handle errors on this fetch method
-        fut = await asyncio.gather(*coros, return_exceptions=True)
+        fut = await asyncio.gather(*(self.fetch_resource(match) for match in to_fetch), return_exceptions=True)
+        fetch_results: dict[ghretos.GitHubResource, githubkit.GitHubModel | BaseException] = dict(
+            zip(to_fetch, fut, strict=True)
+        )
+        if fetched is not None:
+            fetched.update(
+                (match, result) for match, result in fetch_results.items() if not isinstance(result, BaseException)
+            )
 
         tiny_callables = []
 
         repo: str | bool | None = None
         owner: str | None | bool = None
         actual_parsed_resources = set[ghretos.GitHubResource]()
-        for resource_data, (match, size) in zip(fut, resources.items(), strict=True):
+        for match, size in resources.items():
+            if fetched is not None and match in fetched:
+                resource_data = fetched[match]
+            elif match in fetch_results:
+                resource_data = fetch_results[match]
+            else:
+                continue  # unsupported resource type
             if isinstance(resource_data, BaseException):
                 if (
                     isinstance(resource_data, githubkit.exception.RequestFailed)
@@ -338,26 +406,23 @@ class GithubInfo(
     async def get_auto_responder_matcher_settings(self, guild_id: int, config: GuildConfig) -> ghretos.MatcherSettings:
         """Get matcher settings based on guild configuration."""
         matcher_settings = self._get_base_matcher_settings()
-        discussions_allowed: bool = False
+        features = await self.bot.get_guild_feature_set(guild_id)
+        discussions_allowed = constants.Feature.GITHUB_DISCUSSIONS.value in features
         if config.github_issue_linking:
             matcher_settings.shorthand = True
             matcher_settings.short_numberables = True
-            if await self.bot.guild_has_feature(guild_id, constants.Feature.GITHUB_ISSUE_LINKS):
+            if constants.Feature.GITHUB_ISSUE_LINKS.value in features:
                 matcher_settings.issues = True
                 matcher_settings.pull_requests = True
-            if discussions_allowed := await self.bot.guild_has_feature(guild_id, constants.Feature.GITHUB_DISCUSSIONS):
+            if discussions_allowed:
                 matcher_settings.discussions = True
 
-        if config.github_comment_linking and await self.bot.guild_has_feature(
-            guild_id, constants.Feature.GITHUB_COMMENT_LINKS
-        ):
+        if config.github_comment_linking and constants.Feature.GITHUB_COMMENT_LINKS.value in features:
             matcher_settings.issue_comments = True
             matcher_settings.pull_request_comments = True
             matcher_settings.pull_request_review_comments = True
             matcher_settings.pull_request_reviews = True
-            if discussions_allowed or (
-                discussions_allowed := await self.bot.guild_has_feature(guild_id, constants.Feature.GITHUB_DISCUSSIONS)
-            ):
+            if discussions_allowed:
                 matcher_settings.discussion_comments = True
 
         return matcher_settings
@@ -369,14 +434,7 @@ class GithubInfo(
         # Use a dict to deduplicate matches, but keep the original insertion order.
         matches: dict[ghretos.GitHubResource, github_handlers.InfoSize] = {}
         # parse all of the shorthand first
-        for segment in context.text.split():
-            match = ghretos.parse_shorthand(
-                segment,
-                allow_optional_user=True,
-                settings=settings,
-            )
-            if match is None:
-                continue
+        for match in parse_shorthand_segments(context.text, settings):
             # resolve the repo owner if needed
             try:
                 if isinstance(match, ghretos.Repo) and not match.owner:
@@ -388,13 +446,8 @@ class GithubInfo(
 
             matches[match] = github_handlers.InfoSize.TINY
 
-        for url in context.urls:
-            match = ghretos.parse_url(
-                url,
-                settings=settings,
-            )
-            if match is not None:
-                matches[match] = github_handlers.InfoSize.OGP
+        for match in parse_github_urls(context.urls, settings):
+            matches[match] = github_handlers.InfoSize.OGP
 
         if not matches:
             return {}
@@ -702,13 +755,15 @@ class GithubInfo(
             sent_message = await message.channel.send(embed=embed)
             self.autolink_cache.set(
                 message.id,
-                (sent_message, matches),
+                AutolinkReply(sent_message, matches, {}),
             )
             return
 
+        fetched: dict[ghretos.GitHubResource, githubkit.GitHubModel] = {}
         data = await self.get_reply(
             matches,
             settings=matcher_settings,
+            fetched=fetched,
         )
         if not data:
             return
@@ -739,7 +794,7 @@ class GithubInfo(
 
         self.autolink_cache.set(
             message.id,
-            (sent_message, matches),
+            AutolinkReply(sent_message, matches, fetched),
         )
 
     @commands.Cog.listener("on_message_edit")
@@ -756,7 +811,7 @@ class GithubInfo(
 
         app_permissions = after.channel.permissions_for(after.guild.me)
 
-        sent_message, previous_matches = cached
+        sent_message, previous_matches, previous_fetched = cached
 
         context = MessageContext(after.content)
 
@@ -780,13 +835,16 @@ class GithubInfo(
             sent_message = await sent_message.edit(embed=embed)
             self.autolink_cache.set(
                 after.id,
-                (sent_message, matches),
+                AutolinkReply(sent_message, matches, previous_fetched),
             )
             return
 
+        # reuse the models of resources which were already linked, only fetching the newly added ones
+        fetched = {match: previous_fetched[match] for match in matches if match in previous_fetched}
         data = await self.get_reply(
             matches,
             settings=matcher_settings,
+            fetched=fetched,
         )
         if not data:
             return
@@ -821,7 +879,7 @@ class GithubInfo(
         # update the cache with the new matches
         self.autolink_cache.set(
             after.id,
-            (sent_message, matches),
+            AutolinkReply(sent_message, matches, fetched),
         )
 
     @commands.Cog.listener("on_button_click")
@@ -21,8 +21,9 @@ from monty.config import (
     get_category_choices as _get_category_choices,
 )
 from monty.database import GuildConfig
-from monty.errors import BotAccountRequired
+from monty.errors import BotAccountRequired, MontyCommandError
 from monty.log import get_logger
+from monty.utils.invalidation import InvalidationKind
 from monty.utils.messages import DeleteButton
 
 
@@ -365,12 +366,22 @@ class Configuration(
         return
 
     async def _update_config(self, config: GuildConfig, updates: dict[str, Any]) -> GuildConfig:
-        """Update the config with the provided updates."""
-        async with self.bot.db.begin() as session:
-            for attr, value in updates.items():
+        """
+        Update the config with the provided updates, and wait for them to be written to the database.
+
+        If the write fails, the cached config is restored so it keeps matching the database.
+        """
+        previous = {attr: getattr(config, attr) for attr in updates}
+        for attr, value in updates.items():
+            setattr(config, attr, value)
+        try:
+            await self.bot.db_writes.queue(config, *updates)
+        except Exception as e:
+            for attr, value in previous.items():
                 setattr(config, attr, value)
-            config = await session.merge(config)
-            await session.commit()
+            msg = "The configuration could not be saved. Please try again later."
+            raise MontyCommandError(msg) from e
+        await self.bot.invalidation_bus.publish(InvalidationKind.GUILD_CONFIG, config.id)
         return config
 
     async def _handle_merged_select(
@@ -0,0 +1,45 @@
+"""
+Rendering of PyPI package descriptions into truncated markdown.
+
+This runs in the PyPI cog's process pool, as rendering a large README can take seconds of CPU time.
+"""
+
+import bs4
+import readme_renderer.markdown
+import readme_renderer.rst
+import readme_renderer.txt
+
+from monty.utils.markdown import DocMarkdownConverter
+from monty.utils.truncation import get_truncated_description
+
+
+def render_description(package_url: str, description: str, description_content_type: str, max_length: int) -> str:
+    """Render a description into markdown, truncated to `max_length` characters."""
+    if description_content_type and description_content_type not in ("text/markdown", "text/x-rst", "text/plain"):
+        return f"Unknown description content type {description_content_type!r}."
+    if description_content_type.startswith("text/markdown") or description_content_type == "":
+        if "variant=CommonMark" in description_content_type:
+            variant = "CommonMark"
+        else:
+            variant = "GFM"
+        html = readme_renderer.markdown.render(description, variant=variant)
+    elif description_content_type == "text/plain":
+        html = readme_renderer.txt.render(description)
+    elif description_content_type == "text/x-rst":
+        html = readme_renderer.rst.render(description)
+    else:
+        html = None
+    if not html:
+        msg = (
+            "Unreachable code reached in description parsing. HTML is None."
+            f" Content type was {description_content_type!r}"
+        )
+        raise RuntimeError(msg)
+    parsed = bs4.BeautifulSoup(html, "lxml")
+    text = get_truncated_description(
+        parsed.find("body") or parsed,
+        DocMarkdownConverter(page_url=package_url),
+        max_length=max_length,
+        max_lines=21,
+    )
+    return "\n".join([line.rstrip() for line in text.splitlines() if line and not line.isspace()])
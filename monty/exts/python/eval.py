@@ -13,6 +13,7 @@ from disnake.ext import commands
 from monty.bot import Monty
 from monty.constants import Auth, Endpoints, Feature
 from monty.errors import APIError
+from monty.events import MessageContext, MessageExtractor, MontyEvent
 from monty.log import get_logger
 from monty.utils.code import prepare_input
 from monty.utils.extensions import invoke_help_command
@@ -26,6 +27,9 @@ log = get_logger(__name__)
 # copied from PyPI cog for snek management
 
 INLINE_EVAL_REGEX = re.compile(r"\$(?P<fence>`+)(.+)(?P=fence)")
+INLINE_EVAL_EXTRACTOR = MessageContext.register_extractor(
+    MessageExtractor("inline_eval", INLINE_EVAL_REGEX, trigger="$`")
+)
 
 ESCAPE_REGEX = re.compile("[`\u202e\u200b]{3,}")
 
@@ -432,21 +436,18 @@ class Snekbox(
                 break
             log.info(f"Re-evaluating code from message {ctx.message.id}:\n{code}")
 
-    @commands.Cog.listener()
-    async def on_message(self, message: disnake.Message) -> None:
+    @commands.Cog.listener("on_" + MontyEvent.monty_message_processed.value)
+    async def on_message(self, message: disnake.Message, context: MessageContext) -> None:
         """Evaluate code in the message automatically."""
         if not message.guild:
             return
 
-        if message.author.bot:
-            return
+        code = "\n".join([m[2].strip() for m in context.extract(INLINE_EVAL_EXTRACTOR)])
 
-        if not await self.bot.guild_has_feature(message.guild.id, Feature.INLINE_EVALULATION):
+        if not code:
             return
 
-        code = "\n".join([m[-1].strip() for m in INLINE_EVAL_REGEX.findall(message.content)])
-
-        if not code:
+        if Feature.INLINE_EVALULATION.value not in await self.bot.get_guild_feature_set(message.guild.id):
             return
         await self.send_eval(message, code, return_result=False)
 
@@ -1,26 +1,26 @@
+import asyncio
 import dataclasses
-import functools
 from datetime import datetime, timedelta, timezone
 from typing import ClassVar, Literal, cast
 from urllib.parse import urljoin
 
-import bs4
+import aiohttp
 import disnake
 import rapidfuzz
 import rapidfuzz.fuzz
 import rapidfuzz.process
 from bs4 import BeautifulSoup
-from cachingutils import LRUMemoryCache, async_cached
 from disnake.ext import commands, tasks
 
 from monty.bot import Monty
 from monty.errors import MontyCommandError
 from monty.log import get_logger
 from monty.utils import scheduling
+from monty.utils.caching import RedisCache
 from monty.utils.helpers import utcnow
-from monty.utils.html_parsing import _get_truncated_description
 from monty.utils.markdown import DocMarkdownConverter
 from monty.utils.messages import DeleteButton
+from monty.utils.truncation import get_truncated_description
 
 
 log = get_logger(__name__)
@@ -28,6 +28,13 @@ log = get_logger(__name__)
 ICON_URL = "https://www.python.org/static/opengraph-icon-200x200.png"
 API_URL = "https://peps.python.org/api/peps.json"
 
+HEADER_CACHE_TIMEOUT = timedelta(days=1)
+SECTION_CACHE_TIMEOUT = timedelta(days=7)
+# How long the version of a pep page is trusted, before the page is fetched again to check if it changed
+PAGE_VERSION_TIMEOUT = timedelta(hours=3)
+# Seconds to wait between fetching pages while indexing the headers of every PEP, to spread out the requests
+HEADER_INDEX_DELAY = 1
+
 
 # the values below each exist on the api as documented at https://peps.python.org/api/
 # this schema should be kept in sync with that api
@@ -82,6 +89,30 @@ class PEPHeaders:
         return headers
 
 
+def _parse_pep_headers(pep_content: str) -> list[str]:
+    """Parse the headers out of the HTML of a pep page, discarding the soup afterwards."""
+    return list(PEPHeaders().parse(BeautifulSoup(pep_content, "lxml")))
+
+
+def _parse_pep_sections(pep_content: str, url: str) -> dict[str, tuple[str, str | None]]:
+    """
+    Split the HTML of a pep page into the markdown of each section, and the link to that section.
+
+    The soup is only kept while the sections are rendered, as it is far larger than they are.
+    """
+    soup = BeautifulSoup(pep_content, "lxml")
+    sections: dict[str, tuple[str, str | None]] = {}
+    for tag in soup.find_all(PEPHeaders.header_tags):
+        header = tag.text
+        if header == "Contents" or header in sections or not tag.parent:
+            continue
+        text = get_truncated_description(tag.parent, DocMarkdownConverter(page_url=url), max_length=750, max_lines=14)
+        text = (text.lstrip() + "\n").split("\n", 1)[-1].strip()
+        href = tag.a.get("href") if tag.a else None
+        sections[header] = (text, urljoin(url, str(href)) if href else None)
+    return sections
+
+
 class PythonEnhancementProposals(
     commands.Cog,
     name="PEPs",
@@ -96,11 +127,31 @@ class PythonEnhancementProposals(
         self.bot = bot
         self.peps: dict[int, PEPInfo] = {}
         self.autocomplete: dict[str, int] = {}
+        # precomputed search keys for autocomplete, in the same order as the titles and numbers they are for
+        self._autocomplete_titles: list[str] = []
+        self._autocomplete_numbers: list[int] = []
+        self._title_keys: list[str] = []
+        self._number_keys: list[str] = []
+        # pep number -> headers of the pep, mirrored from the header table in redis
+        self.header_cache = RedisCache("peps:headers", timeout=HEADER_CACHE_TIMEOUT)
+        self.pep_headers: dict[int, list[str]] = {}
+        self._header_fetches: dict[int, asyncio.Task[list[str]]] = {}
+        self._header_indexer: asyncio.Task[None] | None = None
+        # pep number -> Last-Modified of the page the cached sections were rendered from
+        self.page_versions = RedisCache("peps:page-versions", timeout=PAGE_VERSION_TIMEOUT)
+        # pep number, page version, and header -> markdown of the section and the link to it
+        self.section_cache = RedisCache("peps:sections", timeout=SECTION_CACHE_TIMEOUT)
         # To avoid situations where we don't have last datetime, set this to now.
         self.last_refreshed_peps: datetime = utcnow()
         scheduling.create_task(self.refresh_peps_urls())
         self.refresh_peps_urls.start()
 
+    def cog_unload(self) -> None:
+        """Stop refreshing the PEPs and indexing their headers."""
+        self.refresh_peps_urls.cancel()
+        if self._header_indexer is not None:
+            self._header_indexer.cancel()
+
     @tasks.loop(hours=3)
     async def refresh_peps_urls(self) -> None:
         """Refresh PEP URLs listing in every 3 hours."""
@@ -128,8 +179,61 @@ class PythonEnhancementProposals(
         self.autocomplete.clear()
         self.autocomplete.update(new_autocomplete)
 
+        self._autocomplete_titles = list(new_autocomplete)
+        self._autocomplete_numbers = list(new_autocomplete.values())
+        self._title_keys = [title.lower() for title in self._autocomplete_titles]
+        self._number_keys = [str(number) for number in self._autocomplete_numbers]
+        # reload the headers from redis, which are refreshed by the indexer
+        self.pep_headers.clear()
+
         log.trace("Got PEP URLs listing from Pep sphinx inventory")
 
+        if self._header_indexer is None or self._header_indexer.done():
+            self._header_indexer = scheduling.create_task(self._index_pep_headers(), name="pep-header-indexer")
+
+    async def _fetch_pep_headers(self, pep_info: PEPInfo) -> list[str]:
+        """Fetch and parse the headers of a PEP, and store them in the header table."""
+        async with self.bot.http_session.get(pep_info.url) as response:
+            response.raise_for_status()
+            pep_content = await response.text()
+
+        headers = await self.bot.loop.run_in_executor(None, _parse_pep_headers, pep_content)
+        await self.header_cache.set(str(pep_info.number), headers)
+        self.pep_headers[pep_info.number] = headers
+        return headers
+
+    def _queue_pep_headers(self, number: int) -> None:
+        """Fetch the headers of a PEP in the background, if they are not already being fetched."""
+        if number in self._header_fetches:
+            return
+        task = scheduling.create_task(self._fetch_pep_headers(self.peps[number]), name=f"pep-headers-{number}")
+        self._header_fetches[number] = task
+        task.add_done_callback(lambda _: self._header_fetches.pop(number, None))
+
+    async def _index_pep_headers(self) -> None:
+        """Fill the header table with the headers of every PEP which are not in it yet."""
+        if not await self.bot.singleton.wait_until_elected():
+            # another process fills the shared table
+            return
+        for number, pep_info in list(self.peps.items()):
+            if await self.header_cache.get(str(number)) is not None:
+                continue
+            try:
+                await self._fetch_pep_headers(pep_info)
+            except aiohttp.ClientError as e:
+                log.warning(f"Could not fetch the headers of PEP {number}: {e}")
+            await asyncio.sleep(HEADER_INDEX_DELAY)
+        log.debug("Finished indexing the headers of every PEP.")
+
+    async def get_pep_headers(self, number: int) -> list[str] | None:
+        """Get the headers of a PEP from the header table, or None if they have not been indexed yet."""
+        if (headers := self.pep_headers.get(number)) is not None:
+            return headers
+        headers = await self.header_cache.get(str(number))
+        if headers is not None:
+            self.pep_headers[number] = headers
+        return headers
+
     async def validate_pep_number(self, pep_nr: int) -> PEPInfo:
         """Validate is PEP number valid. When it isn't, return error embed, otherwise None."""
         if (
@@ -171,37 +275,50 @@ class PythonEnhancementProposals(
 
         return pep_embed
 
-    @async_cached(cache=LRUMemoryCache(25, timeout=int(timedelta(hours=2).total_seconds())))
-    async def fetch_pep_soup(self, pep_info: PEPInfo) -> BeautifulSoup:
-        """Fetch the pep information. This is extracted into a seperate function for future use."""
+    async def fetch_pep_sections(self, pep_info: PEPInfo) -> dict[str, tuple[str, str | None]]:
+        """Fetch a pep page, and cache the markdown of each of its sections along with its headers."""
         async with self.bot.http_session.get(pep_info.url) as response:
             response.raise_for_status()
+            version = response.headers.get("Last-Modified") or response.headers.get("ETag") or ""
             pep_content = await response.text()
 
-        return await self.bot.loop.run_in_executor(None, BeautifulSoup, pep_content, "lxml")
+        sections = await self.bot.loop.run_in_executor(None, _parse_pep_sections, pep_content, pep_info.url)
+        await asyncio.gather(
+            *(
+                self.section_cache.set(f"{pep_info.number}:{version}:{header}", section)
+                for header, section in sections.items()
+            )
+        )
+        await self.page_versions.set(str(pep_info.number), version)
+
+        headers = list(sections)
+        await self.header_cache.set(str(pep_info.number), headers)
+        self.pep_headers[pep_info.number] = headers
+        return sections
 
     async def get_pep_section_header(self, inter: disnake.CommandInteraction, number: int, header: str) -> None:
         """Get the contents of the provided header in the pep body."""
         await self.validate_pep_number(number)
 
         pep_info = self.peps[number]
-        soup = cast(
-            "BeautifulSoup",
-            await self.fetch_pep_soup(pep_info),  # pyright: ignore[reportCallIssue]
-        )
-
-        tag: bs4.element.Tag | None = await self.bot.loop.run_in_executor(
-            None, functools.partial(soup.find, PEPHeaders.header_tags, text=header)
-        )
-
-        if tag is None or not tag.parent:
+        section: tuple[str, str | None] | None = None
+        version: str | None = await self.page_versions.get(str(number))
+        if version is not None:
+            headers = await self.get_pep_headers(number)
+            if headers is not None and header not in headers:
+                # the page was rendered recently, so rendering it again would not find the header either
+                msg = "Could not find the requested header in the PEP."
+                raise MontyCommandError(msg)
+            section = await self.section_cache.get(f"{number}:{version}:{header}")
+        if section is None:
+            # the page changed, or its sections expired, so render them all again from the current page
+            section = (await self.fetch_pep_sections(pep_info)).get(header)
+
+        if section is None:
             msg = "Could not find the requested header in the PEP."
             raise MontyCommandError(msg)
 
-        text = _get_truncated_description(
-            tag.parent, DocMarkdownConverter(page_url=pep_info.url), max_length=750, max_lines=14
-        )
-        text = (text.lstrip() + "\n").split("\n", 1)[-1].strip()
+        text, section_url = section
         if not text:
             msg = "No text found for that header."
             raise MontyCommandError(msg)
@@ -212,8 +329,8 @@ class PythonEnhancementProposals(
         )
         embed.set_author(name=f"PEP {number} - {pep_info.title}", url=pep_info.url)
 
-        if tag.a and (href := tag.a.get("href")):
-            embed.url = urljoin(pep_info.url, str(href))
+        if section_url:
+            embed.url = section_url
 
         embed.set_thumbnail(url=ICON_URL)
         embed.set_footer(text="PEP Created")
@@ -267,28 +384,27 @@ class PythonEnhancementProposals(
         try:
             int(query)
         except ValueError:
-            processor = lambda x: x[0]  # noqa: E731
+            keys = self._title_keys
             query = query.lower()
         else:
-            processor = lambda x: str(x[1])  # noqa: E731
+            keys = self._number_keys
 
         processed = rapidfuzz.process.extract(
-            (query, query),
-            self.autocomplete.items(),
+            query,
+            keys,
             scorer=rapidfuzz.fuzz.ratio,
-            processor=processor,
             limit=11,
             score_cutoff=0,
         )
         top_score = 0
-        for num, ((title, pep), score, _) in enumerate(processed):
+        for num, (_, score, index) in enumerate(processed):
             if num == 0:
                 top_score = score
 
             if top_score > score + 24:
                 break
 
-            peps[title] = pep
+            peps[self._autocomplete_titles[index]] = self._autocomplete_numbers[index]
 
         return peps
 
@@ -303,9 +419,10 @@ class PythonEnhancementProposals(
         if number not in self.peps:
             return [f"Cannot find PEP {number}.", "You must provide a valid pep number before providing a header."]
 
-        soup = await self.fetch_pep_soup(self.peps[number])  # pyright: ignore[reportCallIssue]
-
-        headers = PEPHeaders().parse(soup)
+        headers = await self.get_pep_headers(number)
+        if headers is None:
+            self._queue_pep_headers(number)
+            return [f"The headers of PEP {number} are still being indexed.", "Please try again in a few seconds."]
 
         if not query:
             return list(headers)[:25]
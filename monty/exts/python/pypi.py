@@ -4,6 +4,8 @@ import functools
 import itertools
 import random
 import re
+import time
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from typing import Any
 
@@ -12,24 +14,23 @@ import bs4
 import disnake
 import rapidfuzz.distance
 import rapidfuzz.process
-import readme_renderer.markdown
-import readme_renderer.rst
-import readme_renderer.txt
 import yarl
-from cachingutils import LRUMemoryCache, async_cached
+from cachingutils import async_cached
 from disnake.ext import commands, tasks
 
 from monty.bot import Monty
-from monty.constants import Colours, Endpoints, Feature
+from monty.constants import Client, Colours, Endpoints, Feature, Redis
 from monty.errors import MontyCommandError
+from monty.exts.python._pypi_readme import render_description
 from monty.log import get_logger
 from monty.utils import responses
-from monty.utils.caching import redis_cache
+from monty.utils.caching import RedisCache
 from monty.utils.converters import NOT_PYPI_PACKAGE_REGEX
 from monty.utils.helpers import fromisoformat, maybe_defer, utcnow
-from monty.utils.html_parsing import _get_truncated_description
-from monty.utils.markdown import DocMarkdownConverter
+from monty.utils.invalidation import Invalidation, InvalidationKind
 from monty.utils.messages import DeleteButton
+from monty.utils.package_index import PackageNameIndex, SimpleIndexParser, dump_names, load_names, normalize_name
+from monty.utils.process_pool import ProcessPool
 
 
 BASE_PYPI_URL = "https://pypi.org"
@@ -50,6 +51,22 @@ log = get_logger(__name__)
 
 PYPI_API_HEADERS = {"Accept": "application/vnd.pypi.simple.v1+json"}
 
+PACKAGE_LIST_KEY = f"{Redis.prefix}pypi-package-list"
+PACKAGE_LIST_TIMEOUT = datetime.timedelta(hours=36)
+PACKAGE_INDEX_FILE = Client.cache_directory / "pypi-package-index.bin"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+METADATA_CACHE_TIMEOUT = datetime.timedelta(days=7)
+# cached metadata is served without revalidating it for this long
+METADATA_FRESH_FOR = datetime.timedelta(minutes=5)
+# a release's description never changes, so it only has to expire to free up space
+DESCRIPTION_CACHE_TIMEOUT = datetime.timedelta(days=30)
+RENDER_WORKERS = 2
+# time budget for rendering a description, including starting a worker if none are running
+RENDER_TIMEOUT = datetime.timedelta(seconds=10)
+# a render may only have run out of time because the host was busy, so it is retried after this long
+RENDER_TIMEOUT_CACHE_TIMEOUT = datetime.timedelta(minutes=5)
+
 
 @dataclass
 class Package:
@@ -75,7 +92,12 @@ class PyPI(
         self.searches = {}
         self.fetch_lock = asyncio.Lock()
 
-        self.all_packages: set[str] = set()
+        self.package_index = PackageNameIndex()
+        # normalised name -> (etag, last serial, time fetched, trimmed metadata)
+        self.metadata_cache = RedisCache("pypi:metadata", timeout=METADATA_CACHE_TIMEOUT)
+        # normalised name, version, and length -> rendered description
+        self.description_cache = RedisCache("pypi:descriptions", timeout=DESCRIPTION_CACHE_TIMEOUT)
+        self.render_pool = ProcessPool(max_workers=RENDER_WORKERS)
         self.top_packages: list[str] = []
 
     async def cog_load(self) -> None:
@@ -86,6 +108,7 @@ class PyPI(
         if self.bot.features[Feature.PYPI_AUTOCOMPLETE.value].enabled is not False:
             # start the task
             self.fetch_package_list.start(use_cache=False)
+            self.bot.invalidation_bus.subscribe(InvalidationKind.PYPI_PACKAGES, self._on_package_list_invalidated)
             # pre-fill the autocomplete once
             await self.fetch_package_list(use_cache=True)
         else:
@@ -94,32 +117,34 @@ class PyPI(
     def cog_unload(self) -> None:
         """Remove the autocomplete task on cog unload."""
         self.fetch_package_list.cancel()
+        self.bot.invalidation_bus.unsubscribe(InvalidationKind.PYPI_PACKAGES, self._on_package_list_invalidated)
+        self.render_pool.shutdown()
+
+    async def _on_package_list_invalidated(self, invalidation: Invalidation) -> None:
+        """Load the package list another process just fetched from the shared cache."""
+        await self.fetch_package_list(use_cache=True)
 
     @staticmethod
     def invalid_characters(package: str) -> re.Match | None:
         """Check if the package is valid."""
         return re.search(NOT_PYPI_PACKAGE_REGEX, package)
 
-    @redis_cache(
-        "pypi-package-list",
-        include_posargs=[],
-        key_func=lambda *args, **kwargs: "packages",
-        skip_cache_func=lambda *args, **kwargs: not kwargs.get("use_cache", True),
-        timeout=datetime.timedelta(hours=36),
-    )
-    async def _fetch_package_list(self, *, use_cache: bool = True) -> tuple[set[str], list[str]]:
-        """Fetch all packages from PyPI and cache them."""
-        all_packages: set[str] = set()
+    async def _fetch_package_list(self) -> tuple[list[str], list[str]]:
+        """Fetch all packages and the top packages from PyPI."""
+        all_packages: list[str] = []
         top_packages: list[str] = []
 
         log.debug("Started fetching package list from PyPI.")
+        # the index is tens of megabytes, so parse it as it arrives instead of loading it whole
+        parser = SimpleIndexParser()
         async with (
             self.bot.http_session.disabled(),
             self.bot.http_session.get(SIMPLE_INDEX, raise_for_status=True, headers=PYPI_API_HEADERS) as resp,
         ):
-            json = await resp.json()
+            async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                all_packages.extend(parser.feed(chunk))
+        parser.close()
 
-        all_packages.update(proj["name"] for proj in json["projects"])
         # fetch the top packages as well, if the endpoint is set
         if TOP_PACKAGES:
             try:
@@ -136,63 +161,141 @@ class PyPI(
 
         return all_packages, top_packages
 
+    @staticmethod
+    def _write_package_index(all_packages: list[str], fetched_at: float) -> PackageNameIndex:
+        """Write the package index file shared by every process on this host, and map it."""
+        PackageNameIndex.write(PACKAGE_INDEX_FILE, all_packages, fetched_at=fetched_at)
+        return PackageNameIndex.open(PACKAGE_INDEX_FILE)
+
+    async def _load_cached_package_list(self) -> tuple[PackageNameIndex, list[str]] | None:
+        """Load the package index and top packages cached by another fetch, if they are still cached."""
+        fetched_at, top_blob = await self.bot.redis_session.mget(
+            f"{PACKAGE_LIST_KEY}:fetched", f"{PACKAGE_LIST_KEY}:top"
+        )
+        if fetched_at is None:
+            return None
+        fetched_at = float(fetched_at)
+        top_packages = load_names(top_blob) if top_blob else []
+
+        try:
+            index = PackageNameIndex.open(PACKAGE_INDEX_FILE)
+        except (OSError, ValueError):
+            index = None
+        if index is not None and index.fetched_at == fetched_at:
+            return index, top_packages
+
+        # the list was fetched on another host, or the file was not written yet
+        all_blob = await self.bot.redis_session.get(f"{PACKAGE_LIST_KEY}:all")
+        if all_blob is None:
+            return None
+        all_packages = await asyncio.to_thread(load_names, all_blob)
+        index = await asyncio.to_thread(self._write_package_index, all_packages, fetched_at)
+        return index, top_packages
+
+    async def _cache_package_list(self, all_packages: list[str], top_packages: list[str], fetched_at: float) -> None:
+        """Cache the package lists as compressed newline-delimited blobs."""
+        all_blob = await asyncio.to_thread(dump_names, all_packages)
+        async with self.bot.redis_session.pipeline(transaction=True) as pipe:
+            pipe.set(f"{PACKAGE_LIST_KEY}:all", all_blob, ex=PACKAGE_LIST_TIMEOUT)
+            pipe.set(f"{PACKAGE_LIST_KEY}:top", dump_names(top_packages), ex=PACKAGE_LIST_TIMEOUT)
+            pipe.set(f"{PACKAGE_LIST_KEY}:fetched", repr(fetched_at), ex=PACKAGE_LIST_TIMEOUT)
+            await pipe.execute()
+
     # run this once a day
     @tasks.loop(time=datetime.time(hour=0, minute=0, tzinfo=datetime.timezone.utc))
     async def fetch_package_list(self, *, use_cache: bool = True) -> None:
         """Fetch all packages from PyPI and cache them."""
+        if not use_cache and not await self.bot.singleton.wait_until_elected():
+            # another process fetches the list, and tells this one to load it from the cache
+            return
         log.debug("Might fetch packages from PyPI or use cache.")
-        all_packages, top_packages = await self._fetch_package_list(use_cache=use_cache)
-        self.all_packages.clear()
-        self.all_packages.update(all_packages)
+        cached = await self._load_cached_package_list() if use_cache else None
+        if cached is None:
+            all_packages, top_packages = await self._fetch_package_list()
+            fetched_at = time.time()
+            await self._cache_package_list(all_packages, top_packages, fetched_at)
+            # building the index takes a few seconds at full size, so keep it off the event loop
+            index = await asyncio.to_thread(self._write_package_index, all_packages, fetched_at)
+        else:
+            index, top_packages = cached
+        self.package_index = index
 
         self.top_packages.clear()
         self.top_packages.extend(top_packages)
         log.info("Loaded list of all PyPI packages.")
+        if not use_cache:
+            await self.bot.invalidation_bus.publish(InvalidationKind.PYPI_PACKAGES)
+
+    @staticmethod
+    def _trim_metadata(data: dict[str, Any]) -> dict[str, Any]:
+        """Drop the releases other than the latest from package metadata, as only the latest is displayed."""
+        version = data["info"]["version"]
+        return {"info": data["info"], "releases": {version: data.get("releases", {}).get(version, [])}}
 
     async def fetch_package(self, package: str) -> dict[str, Any] | None:
-        """Fetch a package from PyPI."""
+        """Fetch a package from PyPI, revalidating the cached metadata of it if there is any."""
         if characters := self.invalid_characters(package):
             msg = f"Illegal character(s) passed into command: '{disnake.utils.escape_markdown(characters.group(0))}'"
             raise MontyCommandError(msg)
 
-        async with self.bot.http_session.get(JSON_URL.format(package=package), headers=PYPI_API_HEADERS) as response:
-            if response.status == 200 and response.content_type == "application/json":
-                return await response.json()
-            return None
+        key = normalize_name(package)
+        async with self.metadata_cache.lock(key):
+            cached: tuple[str | None, int, float, dict[str, Any]] | None = await self.metadata_cache.get(key)
+            if cached and time.time() - cached[2] < METADATA_FRESH_FOR.total_seconds():
+                return cached[3]
+
+            headers = PYPI_API_HEADERS.copy()
+            if cached and cached[0]:
+                headers["If-None-Match"] = cached[0]
+            async with (
+                self.bot.http_session.disabled(),
+                self.bot.http_session.get(JSON_URL.format(package=key), headers=headers) as response,
+            ):
+                if response.status == 304 and cached:
+                    etag, serial, _, metadata = cached
+                elif response.status == 200 and response.content_type == "application/json":
+                    etag = response.headers.get("ETag")
+                    serial = int(response.headers.get("X-PyPI-Last-Serial", 0))
+                    metadata = self._trim_metadata(await response.json())
+                else:
+                    return None
+
+            if cached and serial < cached[1]:
+                # served by a CDN node which has not seen the latest change yet, so keep what we had
+                log.debug(f"Ignoring outdated metadata of {key} at serial {serial}, as {cached[1]} is cached.")
+                etag, serial, _, metadata = cached
+            await self.metadata_cache.set(key, (etag, serial, time.time(), metadata))
+        return metadata
 
-    @async_cached(cache=LRUMemoryCache(25, timeout=int(datetime.timedelta(hours=2).total_seconds())))
     async def fetch_description(
-        self, package: str, description: str, description_content_type: str, max_length: int = 1000
+        self, package: str, version: str, description: str, description_content_type: str, max_length: int = 1000
     ) -> str | None:
-        """Fetch a description parsed into markdown from PyPI."""
-        if description_content_type and description_content_type not in ("text/markdown", "text/x-rst", "text/plain"):
-            return f"Unknown description content type {description_content_type!r}."
-        if description_content_type.startswith("text/markdown") or description_content_type == "":
-            if "variant=CommonMark" in description_content_type:
-                variant = "CommonMark"
-            else:
-                variant = "GFM"
-            html = readme_renderer.markdown.render(description, variant=variant)
-        elif description_content_type == "text/plain":
-            html = readme_renderer.txt.render(description)
-        elif description_content_type == "text/x-rst":
-            html = readme_renderer.rst.render(description)
-        else:
-            html = None
-        if not html:
-            msg = (
-                "Unreachable code reached in description parsing. HTML is None."
-                " Content type was {description_content_type!r}"
+        """Fetch a description parsed into markdown from PyPI, which is cached for each release."""
+        key = f"{normalize_name(package)}:{version}:{max_length}"
+        cached: str | None = await self.description_cache.get(key)
+        if cached is not None:
+            return cached or None
+
+        try:
+            text = await self.render_pool.run(
+                render_description,
+                HTML_URL.format(package=package),
+                description,
+                description_content_type,
+                max_length,
+                timeout=RENDER_TIMEOUT.total_seconds(),
             )
-            raise RuntimeError(msg)
-        parsed = await self.bot.loop.run_in_executor(None, bs4.BeautifulSoup, html, "lxml")
-        text = _get_truncated_description(
-            parsed.find("body") or parsed,
-            DocMarkdownConverter(page_url=HTML_URL.format(package=package)),
-            max_length=max_length,
-            max_lines=21,
-        )
-        return "\n".join([line.rstrip() for line in text.splitlines() if line and not line.isspace()])
+        except asyncio.TimeoutError:
+            text = "*The description took too long to render.*"
+            # don't render it again on every lookup, but don't keep the placeholder in place of the description either
+            await self.description_cache.set(key, text, timeout=RENDER_TIMEOUT_CACHE_TIMEOUT.total_seconds())
+            return text
+        except BrokenProcessPool:
+            # rendering was stopped along with another description which took too long
+            return None
+
+        await self.description_cache.set(key, text)
+        return text or None
 
     async def make_pypi_components(
         self, package: str, json: dict, *, with_description: bool = False
@@ -243,7 +346,9 @@ class PyPI(
             # and parse the html to get the rendered description
             # this means that we don't have to parse the rst or markdown or whatever is the
             # project's description content type
-            description = await self.fetch_description(package, description, info["description_content_type"] or "")  # pyright: ignore[reportCallIssue]
+            description = await self.fetch_description(
+                package, info["version"], description, info["description_content_type"] or ""
+            )
             if description:
                 components[0].children.append(disnake.ui.TextDisplay(description))
 
@@ -410,27 +515,26 @@ class PyPI(
             # we need to shortcircuit and skip the fuzzing results
             return list(random.sample(the_sample, k=min(25, len(the_sample))))
 
-        if await self.bot.guild_has_feature(inter.guild_id, Feature.PYPI_AUTOCOMPLETE):
-            package_list = self.all_packages
+        if self.package_index and await self.bot.guild_has_feature(inter.guild_id, Feature.PYPI_AUTOCOMPLETE):
+            # only a bounded set of candidates from the index is scored, rather than every package
+            res = self.package_index.search(query, limit=25, score_cutoff=0.4)
         else:
-            package_list = self.top_packages
+            if not self.top_packages:
+                return [query]
             # include the query as top_packages is not a complete list of packages
             include_query = True
 
-        if not package_list:
-            return [query] if query else ["Type to begin searching..."]
-
-        scorer = rapidfuzz.distance.JaroWinkler.similarity
-        fuzz_results = rapidfuzz.process.extract(
-            query,
-            package_list,
-            scorer=scorer,
-            limit=25,
-            score_cutoff=0.4,
-        )
+            scorer = rapidfuzz.distance.JaroWinkler.similarity
+            fuzz_results = rapidfuzz.process.extract(
+                query,
+                self.top_packages,
+                scorer=scorer,
+                limit=25,
+                score_cutoff=0.4,
+            )
 
-        # make the completion
-        res = [value for value, score, key in fuzz_results]
+            # make the completion
+            res = [value for value, score, key in fuzz_results]
 
         # we need to make sure the query is included and at the top if we're supposed to include it
         if include_query:
@@ -1,3 +1,4 @@
+import asyncio
 import re
 from dataclasses import dataclass
 from datetime import timedelta
@@ -6,24 +7,50 @@ from urllib.parse import urljoin
 
 import aiohttp
 import disnake
-from cachingutils import LRUMemoryCache, async_cached
 from disnake.ext import commands
 
 from monty.bot import Monty
 from monty.constants import Feature, Icons
+from monty.events import MessageContext, MessageExtractor, MontyEvent
 from monty.log import get_logger
 from monty.utils import scheduling
+from monty.utils.caching import CappedRedisCache
 from monty.utils.helpers import fromisoformat, get_num_suffix
-from monty.utils.messages import DeleteButton, extract_urls, suppress_embeds
+from monty.utils.messages import DeleteButton, suppress_embeds
 
 
 DOMAIN = "https://discuss.python.org"
 TOPIC_REGEX = re.compile(r"https?:\/\/discuss\.python\.org\/t\/(?:[^\s\/]*\/)*?(?P<num>\d+)(?:\/(?P<reply>\d+))?[^\s]*")
+TOPIC_EXTRACTOR = MessageContext.register_extractor(
+    MessageExtractor("python_discourse_topics", TOPIC_REGEX, source="urls", trigger="discuss.python.org")
+)
 # https://docs.discourse.org/#tag/Posts
 TOPIC_API_URL = f"{DOMAIN}/t/{{id}}.json"
 # https://docs.discourse.org/#tag/Topics
 POST_API_URL = f"{DOMAIN}/posts/{{id}}.json"
 
+# Topic titles rarely change, but posts may be edited, so those are kept for less time
+TOPIC_CACHE_TIMEOUT = timedelta(hours=6)
+POST_CACHE_TIMEOUT = timedelta(minutes=30)
+# Post bodies are trimmed to this many characters before being cached or shown
+POST_BODY_LIMIT = 2700
+# Upper bounds on the number of topics and posts cached at once, which with trimmed bodies keeps the caches to a
+# few megabytes
+MAX_CACHED_TOPICS = 2_000
+MAX_CACHED_POSTS = 2_000
+# The only post fields used for embeds, everything else is dropped before caching
+POST_FIELDS = (
+    "id",
+    "post_number",
+    "topic_id",
+    "topic_slug",
+    "name",
+    "username",
+    "avatar_template",
+    "created_at",
+    "raw",
+)
+
 
 logger = get_logger(__name__)
 
@@ -54,39 +81,80 @@ class PythonDiscourse(commands.Cog):
 
     def __init__(self, bot: Monty) -> None:
         self.bot = bot
+        # topic id -> topic title and url
+        self.topic_cache = CappedRedisCache(
+            bot.redis_session, "python-discourse:topics", max_size=MAX_CACHED_TOPICS, timeout=TOPIC_CACHE_TIMEOUT
+        )
+        # topic id and post number -> trimmed post
+        self.post_cache = CappedRedisCache(
+            bot.redis_session, "python-discourse:posts", max_size=MAX_CACHED_POSTS, timeout=POST_CACHE_TIMEOUT
+        )
 
-    @async_cached(cache=LRUMemoryCache(50, timeout=int(timedelta(minutes=10).total_seconds())))
     async def fetch_data(self, url: str) -> dict[str, Any]:
-        """Fetch the url. Results are cached."""
+        """Fetch the url."""
         async with self.bot.http_session.get(url, raise_for_status=True) as r:
             return await r.json()
 
-    async def fetch_post(self, topic: DiscussionTopic) -> tuple[dict[str, Any], TopicInfo]:
-        """Fetch a python discourse post knowing the topic and reply id."""
-        if topic.reply_id is not None:
-            index = topic.reply_id
-            url = TOPIC_API_URL.format(id=f"{topic.id}/{index}")
-            data = await self.fetch_data(url)  # type: ignore
-        else:
-            url = TOPIC_API_URL.format(id=topic.id)
-            data = await self.fetch_data(url)  # type: ignore
-            index = 1
-        posts = data["post_stream"]["posts"]
-        post_id = next(filter(lambda p: p["post_number"] == index, posts))["id"]
-
-        topic_info = TopicInfo(title=data["title"], url=f"{DOMAIN}/t/{data['slug']}/{data['id']}")
-
-        data = await self.fetch_data(POST_API_URL.format(id=post_id))  # type: ignore
-        return data, topic_info
+    @staticmethod
+    def _trim_post(data: dict[str, Any]) -> dict[str, Any]:
+        """Drop the fields of a post which aren't displayed, and shorten its body."""
+        post = {field: data.get(field) for field in POST_FIELDS}
+        body: str = post["raw"]
+        if len(body) > POST_BODY_LIMIT:
+            post["raw"] = body[: POST_BODY_LIMIT - 3] + "..."
+        return post
+
+    async def _cache_posts(self, stream: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Trim and cache the provided posts."""
+        posts = [self._trim_post(data) for data in stream]
+        await self.post_cache.set_many({f"{post['topic_id']}:{post['post_number']}": post for post in posts})
+        return posts
+
+    async def fetch_post(self, topic: DiscussionTopic) -> tuple[dict[str, Any], TopicInfo] | None:
+        """
+        Fetch a python discourse post knowing the topic and reply id.
+
+        The topic is requested with the raw body of each post in its stream, so the requested post and those around
+        it are usually all cached from a single request. The post endpoint is only used when a post's body is missing.
+        """
+        index = topic.reply_id if topic.reply_id is not None else 1
+
+        post = await self.post_cache.get(f"{topic.id}:{index}")
+        topic_data: dict[str, str] | None = await self.topic_cache.get(str(topic.id))
+        if post is not None and topic_data is not None:
+            return post, TopicInfo(**topic_data)
+
+        url = TOPIC_API_URL.format(id=topic.id if topic.reply_id is None else f"{topic.id}/{index}")
+        data = await self.fetch_data(f"{url}?include_raw=true")
+
+        topic_data = {"title": data["title"], "url": f"{DOMAIN}/t/{data['slug']}/{data['id']}"}
+        await self.topic_cache.set(str(topic.id), topic_data)
+
+        stream: list[dict[str, Any]] = data["post_stream"]["posts"]
+        cached = await self._cache_posts([p for p in stream if p.get("raw") is not None])
+
+        post = next((p for p in cached if p["post_number"] == index), None)
+        if post is None:
+            stream_post = next((p for p in stream if p["post_number"] == index), None)
+            if stream_post is None:
+                return None
+            (post,) = await self._cache_posts([await self.fetch_data(POST_API_URL.format(id=stream_post["id"]))])
+
+        return post, TopicInfo(**topic_data)
+
+    async def _try_fetch_post(self, topic: DiscussionTopic) -> tuple[dict[str, Any], TopicInfo] | None:
+        try:
+            return await self.fetch_post(topic)
+        except aiohttp.ClientResponseError:
+            return None
 
     def make_post_embed(self, data: dict[str, Any], topic_info: TopicInfo | None = None) -> disnake.Embed:
         """Return an embed representing the provided post and topic information."""
         # consider parsing this into markdown
-        limit = 2700
         body: str = data["raw"]
 
-        if len(body) > limit:
-            body = body[: limit - 3] + "..."
+        if len(body) > POST_BODY_LIMIT:
+            body = body[: POST_BODY_LIMIT - 3] + "..."
         e = disnake.Embed(description=body)
 
         is_reply = data["post_number"] > 1
@@ -112,35 +180,29 @@ class PythonDiscourse(commands.Cog):
         e.set_footer(text="Posted at", icon_url=Icons.python_discourse)
         return e
 
-    def extract_topic_urls(self, content: str) -> list[DiscussionTopic]:
-        """Extract python discourse urls from the provided content."""
+    def extract_topic_urls(self, context: MessageContext) -> list[DiscussionTopic]:
+        """Extract python discourse urls from the provided message context."""
         return [
             DiscussionTopic(
                 id=match.group("num"),
                 url=match[0],
                 reply=match.group("reply"),
             )
-            for match in filter(None, map(TOPIC_REGEX.fullmatch, extract_urls(content)))
+            for match in context.extract(TOPIC_EXTRACTOR)
         ]
 
-    @commands.Cog.listener("on_message")
-    async def on_message(self, message: disnake.Message) -> None:
+    @commands.Cog.listener("on_" + MontyEvent.monty_message_processed.value)
+    async def on_message(self, message: disnake.Message, context: MessageContext) -> None:
         """Automatically link python discourse urls."""
-        if message.author.bot:
-            return
-
         if not message.guild:
             return
 
-        if not message.content:
-            return
+        posts = self.extract_topic_urls(context)
 
-        if not await self.bot.guild_has_feature(message.guild, Feature.PYTHON_DISCOURSE_AUTOLINK):
+        if not posts:
             return
 
-        posts = self.extract_topic_urls(message.content)
-
-        if not posts:
+        if Feature.PYTHON_DISCOURSE_AUTOLINK.value not in await self.bot.get_guild_feature_set(message.guild.id):
             return
 
         posts = list(dict.fromkeys(posts, None))
@@ -160,10 +222,8 @@ class PythonDiscourse(commands.Cog):
         embeds = []
         components: list[disnake.ui.Button] = []
         chars = 0
-        for post in posts:
-            try:
-                data = await self.fetch_post(post)
-            except aiohttp.ClientResponseError:
+        for data in await asyncio.gather(*map(self._try_fetch_post, posts)):
+            if data is None:
                 continue
 
             embed = self.make_post_embed(*data)
@@ -1,10 +1,11 @@
 import asyncio
+import hashlib
 import itertools
 import json
 import random
 import re
-from functools import cache
-from typing import TYPE_CHECKING, Any, Literal
+from datetime import timedelta
+from typing import TYPE_CHECKING, Literal
 
 import attrs
 import disnake
@@ -15,6 +16,7 @@ from disnake.ext import commands, tasks
 from monty import constants
 from monty.bot import Monty
 from monty.log import get_logger
+from monty.utils.caching import RedisCache
 from monty.utils.converters import NOT_PYPI_PACKAGE_REGEX
 from monty.utils.helpers import utcnow
 from monty.utils.messages import DeleteButton
@@ -22,6 +24,7 @@ from monty.utils.messages import DeleteButton
 
 if TYPE_CHECKING:
     import datetime
+    from collections.abc import Iterable
 
 
 logger = get_logger(__name__)
@@ -32,8 +35,52 @@ RUFF_LINTERS = "https://raw.githubusercontent.com/onerandomusername/ruff-rules/r
 
 RUFF_RULES_BASE_URL = "https://docs.astral.sh/ruff/rules"
 
+# the last fetched sources are kept so the cog is usable straight after a restart
+SOURCE_CACHE_TIMEOUT = timedelta(days=7)
+
 RUFF_COLOUR_CYCLE = itertools.cycle(disnake.Colour(c) for c in (0xD7FF66, 0x30173D))
 
+# [name]: link references in a rule explanation
+REFERENCE_RE = re.compile(r"^\[([^\]]+)\]:\s*(\S+)", re.MULTILINE)
+SECTION_HEADER_RE = re.compile(r"^## (.+)$", re.MULTILINE)
+CODEBLOCK_SPACING_RE = re.compile(r"(```[\w]*\n[\s\S]*?```)(\n{2,})")
+EMPTY_QUOTE_RE = re.compile(r"^(>+)\s*$", re.MULTILINE)
+
+
+def parse_sections(explanation: str) -> tuple[tuple[str, str], ...]:
+    """
+    Split a rule explanation into markdown sections while normalizing codeblock spacing and converting reference links.
+
+    Returns
+    -------
+    tuple[tuple[str, str], ...]
+        Tuples containing section names and their corresponding content.
+    """
+    sections: list[tuple[str, str]] = []
+    text = explanation
+
+    # support markdown shorthand when they're defined
+    # Find all [name]: link references in the entire content
+    refs = dict(REFERENCE_RE.findall(text))
+    # Remove reference lines from content
+    text = REFERENCE_RE.sub("", text)
+    # Replace all [xyz] with [xyz](link) throughout the content
+    for label, url in refs.items():
+        text = re.sub(rf"\[{re.escape(label)}\]", f"[{label}]({url})", text)
+
+    matches = list(SECTION_HEADER_RE.finditer(text))
+    for i, match in enumerate(matches):
+        name = match.group(1).strip()
+        start = match.end()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        content = text[start:end].strip()
+        # Normalize codeblock endings: ensure only one newline after each codeblock
+        content = CODEBLOCK_SPACING_RE.sub(r"\1\n", content)
+        # Normalize quotes: ensure that >> lines have whitespace
+        content = EMPTY_QUOTE_RE.sub(r"\1 ", content)
+        sections.append((name, content))
+    return tuple(sections)
+
 
 @attrs.define(hash=True, frozen=True)
 class Category:
@@ -118,6 +165,13 @@ class Rule:
     explanation: str
     preview: bool
     status: dict[str, dict[str, str]] = attrs.field(hash=False)  # {"Stable": { "since": "v0.0.213"}}
+    # the explanation split into sections, parsed once when the rule is loaded
+    sections: tuple[tuple[str, str], ...] = attrs.field(
+        default=attrs.Factory(lambda self: parse_sections(self.explanation), takes_self=True),
+        init=False,
+        hash=False,
+        eq=False,
+    )
 
     @property
     def title(self) -> str:
@@ -150,47 +204,93 @@ class Rule:
         """Return the URL to the rule documentation."""
         return f"{RUFF_RULES_BASE_URL}/{self.name}/"
 
-    @cache  # noqa: B019
-    def all_sections(self) -> list[tuple[str, str]]:
-        """
-        Return all markdown sections while normalizing codeblock spacing and converting reference links.
-
-        Returns
-        -------
-        list[tuple[str, str]]
-            A list of tuples containing section names and their corresponding content.
-        """
-        sections: list[tuple[str, str]] = []
-        text = self.explanation
-
-        # support markdown shorthand when they're defined
-        # Find all [name]: link references in the entire content
-        ref_pattern = re.compile(r"^\[([^\]]+)\]:\s*(\S+)", re.MULTILINE)
-        refs = dict(ref_pattern.findall(text))
-        # Remove reference lines from content
-        text = ref_pattern.sub("", text)
-        # Replace all [xyz] with [xyz](link) throughout the content
-        for label, url in refs.items():
-            text = re.sub(rf"\[{re.escape(label)}\]", f"[{label}]({url})", text)
-
-        pattern = re.compile(r"^## (.+)$", re.MULTILINE)
-        matches = list(pattern.finditer(text))
-        for i, match in enumerate(matches):
-            name = match.group(1).strip()
-            start = match.end()
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-            content = text[start:end].strip()
-            # Normalize codeblock endings: ensure only one newline after each codeblock
-            content = re.sub(r"(```[\w]*\n[\s\S]*?```)(\n{2,})", r"\1\n", content)
-            # Normalize quotes: ensure that >> lines have whitespace
-            content = re.sub(r"^(>+)\s*$", r"\1 ", content, flags=re.MULTILINE)
-            sections.append((name, content))
-        return sections
-
     @classmethod
     def from_dict(cls, data: dict):
         """Create a Rule from a dictionary."""
-        return cls(**{a.name: data[a.name] for a in attrs.fields(cls)})
+        return cls(**{a.name: data[a.name] for a in attrs.fields(cls) if a.init and a.name in data})
+
+
+@attrs.define(frozen=True)
+class SearchIndex:
+    """
+    Precomputed autocomplete keys for rules or linters.
+
+    The casefolded IDs and autocomplete titles are stored in a single list, so a query is scored against both in
+    one pass.
+    """
+
+    ids: tuple[str, ...]
+    titles: tuple[str, ...]
+    keys: tuple[str, ...]
+
+    @classmethod
+    def build(cls, items: "Iterable[Rule | Linter]") -> "SearchIndex":
+        """Build an index over the provided rules or linters."""
+        items = tuple(items)
+        ids = tuple(item.id for item in items)
+        titles = tuple(item.autocomplete for item in items)
+        keys = tuple(key.casefold() for key in itertools.chain(ids, titles))
+        return cls(ids=ids, titles=titles, keys=keys)
+
+    def search(self, query: str, *, limit: int = 20) -> dict[str, str]:
+        """Return up to `limit` titles mapped to the ID of the rule or linter, best match first."""
+        results = rapidfuzz.process.extract(
+            query.casefold(),
+            self.keys,
+            scorer=rapidfuzz.fuzz.WRatio,
+            # an item can match on both its ID and its title
+            limit=limit * 2,
+            score_cutoff=0.6,
+        )
+        matches: dict[str, str] = {}
+        for _, _, index in results:
+            index %= len(self.ids)
+            matches.setdefault(self.titles[index], self.ids[index])
+            if len(matches) >= limit:
+                break
+        return matches
+
+
+@attrs.define(frozen=True)
+class Source:
+    """The last fetched version of a source file, and the validators to check whether it changed."""
+
+    etag: str | None
+    digest: str
+    text: str
+
+
+@attrs.define(frozen=True)
+class RuffDataset:
+    """Every rule and linter, along with their search indexes, prepared together so they can be swapped at once."""
+
+    rules: dict[str, Rule]
+    linters: dict[str, Linter]
+    rule_index: SearchIndex
+    linter_index: SearchIndex
+
+    @classmethod
+    def parse(cls, rules_text: str, linters_text: str) -> "RuffDataset":
+        """Parse the rules and linters sources."""
+        rules: dict[str, Rule] = {}
+        for unparsed_rule in json.loads(rules_text):
+            parsed_rule = Rule.from_dict(unparsed_rule)
+            rules[parsed_rule.code] = parsed_rule
+
+        linters: dict[str, Linter] = {}
+        for unparsed_linter in json.loads(linters_text):
+            parsed_linter = Linter.from_dict(unparsed_linter)
+            linters[parsed_linter.name.casefold()] = parsed_linter
+
+        return cls(
+            rules=rules,
+            linters=linters,
+            rule_index=SearchIndex.build(rules.values()),
+            linter_index=SearchIndex.build(linters.values()),
+        )
+
+
+EMPTY_DATASET = RuffDataset(rules={}, linters={}, rule_index=SearchIndex.build(()), linter_index=SearchIndex.build(()))
 
 
 class Ruff(
@@ -206,61 +306,107 @@ class Ruff(
         self.bot = bot
         self.fetch_lock = asyncio.Lock()
 
-        self.rules: dict[str, Rule] = {}
-        self.linters: dict[str, Linter] = {}
+        # replaced as a whole whenever either source changes, so commands never see a half-updated dataset
+        self.dataset = EMPTY_DATASET
+        # url -> (etag, digest, text)
+        self.source_cache = RedisCache("ruff:sources", timeout=SOURCE_CACHE_TIMEOUT)
+        self._sources: dict[str, Source] = {}
 
         self.last_fetched: datetime.datetime | None = None
 
+    @property
+    def rules(self) -> dict[str, Rule]:
+        """Every ruff rule, by code."""
+        return self.dataset.rules
+
+    @property
+    def linters(self) -> dict[str, Linter]:
+        """Every linter, by casefolded name."""
+        return self.dataset.linters
+
     async def cog_load(self) -> None:
         """Load the rules on cog load."""
+        if not await self._load_cached_sources():
+            # pre-fill the autocomplete once
+            await self.update_ruff_cache()
         # start the task
         self.update_ruff_cache.start()
-        # pre-fill the autocomplete once
-        await self.update_ruff_cache()
 
     def cog_unload(self) -> None:
         """Remove the autocomplete task on cog unload."""
         self.update_ruff_cache.cancel()
 
-    async def _fetch_source(self, url: str) -> Any:
-        async with self.bot.http_session.get(url) as response:
-            if response.status == 200:
-                return json.loads(await response.text())
+    async def _load_cached_sources(self) -> bool:
+        """Load the dataset from the sources which were last fetched, returning whether they were cached."""
+        sources: dict[str, Source] = {}
+        for url in (RUFF_RULES, RUFF_LINTERS):
+            cached: tuple[str | None, str, str] | None = await self.source_cache.get(url)
+            if cached is None:
+                return False
+            sources[url] = Source(*cached)
+
+        try:
+            dataset = RuffDataset.parse(sources[RUFF_RULES].text, sources[RUFF_LINTERS].text)
+        except (ValueError, KeyError, TypeError):
+            logger.exception("Could not parse the cached ruff rules.")
+            return False
+        self._sources = sources
+        self.dataset = dataset
+        logger.info("Loaded all ruff rules from the cache.")
+        return True
+
+    async def _cache_source(self, url: str, source: Source) -> None:
+        await self.source_cache.set(url, (source.etag, source.digest, source.text))
+
+    async def _fetch_source(self, url: str) -> Source | None:
+        """Fetch a source if it changed since it was last fetched, returning None if it is unchanged or failed."""
+        previous = self._sources.get(url)
+        headers = {"If-None-Match": previous.etag} if previous and previous.etag else {}
+        async with (
+            self.bot.http_session.disabled(),
+            self.bot.http_session.get(url, headers=headers) as response,
+        ):
+            if response.status == 304:
+                return None
+            if response.status != 200:
+                logger.error(f"Failed to fetch {url}, got status {response.status}")
+                return None
+            text = await response.text()
+            etag = response.headers.get("ETag")
+
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        if previous and previous.digest == digest:
+            # the etag changed without the content changing, such as after the file was served by another node
+            self._sources[url] = attrs.evolve(previous, etag=etag)
+            await self._cache_source(url, self._sources[url])
             return None
+        return Source(etag, digest, text)
 
     @tasks.loop(minutes=10)
-    # @async_cached(cache=LRUMemoryCache(25, timeout=int(datetime.timedelta(hours=2).total_seconds())))
-    async def update_ruff_cache(self) -> dict[str, Any] | None:
-        """Fetch Ruff rules."""
-        raw_rules = await self._fetch_source(RUFF_RULES)
-        if not raw_rules:
-            logger.error("Failed to fetch rules, something went wrong")
-            self.last_fetched = utcnow()  # don't try again for an hour
+    async def update_ruff_cache(self) -> None:
+        """Fetch Ruff rules, only parsing them again if they changed."""
+        changed: dict[str, Source] = {}
+        for url in (RUFF_RULES, RUFF_LINTERS):
+            if source := await self._fetch_source(url):
+                changed[url] = source
+        self.last_fetched = utcnow()
+        if not changed:
             return
 
-        new_rules = dict[str, Rule]()
-        for unparsed_rule in raw_rules:
-            parsed_rule = Rule.from_dict(unparsed_rule)
-            new_rules[parsed_rule.code] = parsed_rule
-
-        raw_linters = await self._fetch_source(RUFF_LINTERS)
-        if not raw_linters:
-            logger.error("Failed to fetch linters, something went wrong")
-            self.last_fetched = utcnow()  # don't try again for an hour
+        sources = self._sources | changed
+        if RUFF_RULES not in sources or RUFF_LINTERS not in sources:
+            logger.error("Failed to fetch rules, something went wrong")
+            return
+        try:
+            dataset = RuffDataset.parse(sources[RUFF_RULES].text, sources[RUFF_LINTERS].text)
+        except (ValueError, KeyError, TypeError):
+            logger.exception("Could not parse the fetched ruff rules, keeping the previous rules.")
             return
 
-        new_linters = dict[str, Linter]()
-        for unparsed_linter in raw_linters:
-            parsed_linter = Linter.from_dict(unparsed_linter)
-            new_linters[parsed_linter.name.casefold()] = parsed_linter
-
-        self.rules.clear()
-        self.rules.update(new_rules)
-        self.linters.clear()
-        self.linters.update(new_linters)
-
+        self._sources = sources
+        self.dataset = dataset
+        await asyncio.gather(*(self._cache_source(url, source) for url, source in changed.items()))
         logger.info("Successfully loaded all ruff rules!")
-        self.last_fetched = utcnow()
 
     @commands.slash_command(name="ruff")
     async def ruff(self, inter: disnake.ApplicationCommandInteraction) -> None:
@@ -380,7 +526,7 @@ class Ruff(
         if description:
             container.children.append(disnake.ui.TextDisplay(description))
 
-        for name, section in rule_obj.all_sections():
+        for name, section in rule_obj.sections:
             container.children.append(disnake.ui.TextDisplay(f"### {name}\n{section}"))
 
         # Add Delete and View More buttons
@@ -459,53 +605,20 @@ class Ruff(
         """Provide autocomplete for ruff rules."""
         # return dict(sorted([[code, code] for code, rule in self.rules.items()])[:25])
         if attr_list == "rule":
-            rules_dict = self.rules
-            option = option.upper().strip()
+            rules_dict, index = self.rules, self.dataset.rule_index
         elif attr_list == "linter":
-            rules_dict = self.linters
-            option = option.lower().strip()
+            rules_dict, index = self.linters, self.dataset.linter_index
         else:
             return {}
 
         if not rules_dict:
             return {}
 
+        option = option.strip()
         if not option:
             return {rule.autocomplete: rule.id for rule in random.choices(list(rules_dict.values()), k=12)}
 
-        class Fake:
-            autocomplete = option.upper() if attr_list == "linter" else option.lower()
-
-        # score twice, once on name, and once on the full name with the code
-        results = rapidfuzz.process.extract(
-            (option, Fake),  # must be a nested sequence because of the preprocessor
-            rules_dict.items(),
-            scorer=rapidfuzz.fuzz.WRatio,
-            limit=20,
-            processor=lambda x: x[0],
-            score_cutoff=0.6,
-        )
-        results2 = rapidfuzz.process.extract(
-            (option, Fake),  # must be a nested sequence because of the preprocessor
-            rules_dict.items(),
-            scorer=rapidfuzz.fuzz.WRatio,
-            limit=20,
-            processor=lambda x: x[1].autocomplete,
-            score_cutoff=0.6,
-        )
-
-        # get the best matches from both
-        matches: dict[str, str] = {}
-        for _ in range(20):
-            if results and results[0][1] > results2[0][1]:
-                code, rule = results.pop(0)[0]
-            elif results2:
-                code, rule = results2.pop(0)[0]
-            else:
-                break
-            matches[rule.autocomplete] = code
-
-        return matches
+        return index.search(option, limit=20)
 
     @ruff_rules.autocomplete("rule")
     async def ruff_rule_autocomplete(self, inter: disnake.ApplicationCommandInteraction, option: str) -> dict[str, str]:
@@ -12,6 +12,7 @@ from PIL import Image, ImageColor
 
 from monty.bot import Monty
 from monty.errors import MontyCommandError
+from monty.utils.colour_index import ColourIndex
 from monty.utils.extensions import invoke_help_command
 from monty.utils.messages import DeleteButton
 
@@ -33,6 +34,9 @@ class Colour(
         with pathlib.Path("monty/resources/ryanzec_colours.json").open() as f:
             self.colour_mapping = json.load(f)
             del self.colour_mapping["_"]  # Delete source credit entry
+        self.colour_index = ColourIndex(
+            {name: tuple(bytes.fromhex(hex_code)) for name, hex_code in self.colour_mapping.items()}
+        )
 
     async def send_colour_response(
         self,
@@ -388,18 +392,8 @@ class Colour(
         return f"#{hex_}".upper()
 
     def _rgb_to_name(self, rgb: tuple[int, int, int]) -> str | None:
-        """Convert RGB values to a fuzzy matched name."""
-        input_hex_colour = self._rgb_to_hex(rgb)
-        try:
-            result = rapidfuzz.process.extractOne(
-                query=input_hex_colour, choices=self.colour_mapping.values(), score_cutoff=80
-            )
-            if result:
-                match, _certainty, _ = result
-                return next(name for name, hex_code in self.colour_mapping.items() if hex_code == match)
-        except (TypeError, ValueError):
-            pass
-        return None
+        """Convert RGB values to the name of the perceptually nearest named colour."""
+        return self.colour_index.nearest(rgb)
 
     def match_colour_name(self, input_colour_name: str) -> str | None:
         """Convert a colour name to HEX code."""
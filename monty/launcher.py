@@ -0,0 +1,154 @@
+"""
+Multi-process launcher.
+
+When `BOT_PROCESSES` is more than one, `python -m monty` runs this supervisor instead of the bot. It splits the shards
+between that many worker processes, each running `python -m monty` for its own shard IDs, and restarts any worker
+which crashes. Workers share redis and postgres, stay coherent through the invalidation bus, and elect a single
+process to run singleton jobs.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+
+import aiohttp
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from monty import constants
+from monty.log import get_logger
+from monty.migrations import run_alembic
+
+
+log = get_logger(__name__)
+
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+# Delay before restarting a crashed worker, doubled for each consecutive crash up to the maximum
+RESTART_DELAY = 5
+MAX_RESTART_DELAY = 300
+# Workers which ran for at least this many seconds are considered healthy, resetting the restart delay
+HEALTHY_RUNTIME = 600
+# Seconds to wait for workers to exit after being asked to, before they are killed
+SHUTDOWN_TIMEOUT = 30
+
+
+async def fetch_recommended_shard_count() -> int:
+    """Fetch the number of shards Discord recommends for the bot."""
+    headers = {"Authorization": f"Bot {constants.Client.token}"}
+    async with (
+        aiohttp.ClientSession() as session,
+        session.get(GATEWAY_BOT_URL, headers=headers, proxy=constants.Client.proxy, raise_for_status=True) as resp,
+    ):
+        data = await resp.json()
+    return data["shards"]
+
+
+def split_shards(shard_count: int, processes: int) -> list[list[int]]:
+    """Split the shard IDs evenly between the provided number of processes."""
+    return [list(range(worker, shard_count, processes)) for worker in range(min(processes, shard_count))]
+
+
+class Supervisor:
+    """Runs and restarts the worker processes."""
+
+    def __init__(self, shard_count: int, processes: int) -> None:
+        self.shard_count = shard_count
+        self.shards = split_shards(shard_count, processes)
+        self.workers: dict[int, asyncio.subprocess.Process] = {}
+        self.stopping = asyncio.Event()
+
+    def _worker_env(self, worker: int) -> dict[str, str]:
+        env = os.environ.copy()
+        env.update(
+            {
+                # workers still know there are other processes, so they elect one to run singleton jobs
+                "BOT_PROCESSES": str(len(self.shards)),
+                "BOT_SHARD_COUNT": str(self.shard_count),
+                "BOT_SHARD_IDS": json.dumps(self.shards[worker]),
+                # migrations are run once by the supervisor
+                "DB_RUN_MIGRATIONS": "false",
+            }
+        )
+        return env
+
+    async def _run_worker(self, worker: int) -> None:
+        """Run a worker until the supervisor stops, restarting it whenever it exits unexpectedly."""
+        delay = RESTART_DELAY
+        loop = asyncio.get_running_loop()
+        while not self.stopping.is_set():
+            log.info(f"Starting worker {worker} with shards {self.shards[worker]}.")
+            started = loop.time()
+            process = await asyncio.create_subprocess_exec(sys.executable, "-m", "monty", env=self._worker_env(worker))
+            self.workers[worker] = process
+            returncode = await process.wait()
+            del self.workers[worker]
+
+            if self.stopping.is_set():
+                break
+            if loop.time() - started >= HEALTHY_RUNTIME:
+                delay = RESTART_DELAY
+            log.error(f"Worker {worker} exited with code {returncode}, restarting in {delay} seconds.")
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, MAX_RESTART_DELAY)
+
+    async def _stop_workers(self) -> None:
+        processes = [process for process in self.workers.values() if process.returncode is None]
+        if not processes:
+            return
+        for process in processes:
+            process.terminate()
+
+        _, pending = await asyncio.wait(
+            [asyncio.ensure_future(process.wait()) for process in processes], timeout=SHUTDOWN_TIMEOUT
+        )
+        if pending:
+            log.warning(f"{len(pending)} workers did not exit in time, killing them.")
+            for process in processes:
+                if process.returncode is None:
+                    process.kill()
+
+    async def run(self) -> None:
+        """Run every worker until the supervisor receives a signal to stop."""
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.stopping.set)
+            loop.add_signal_handler(signal.SIGTERM, self.stopping.set)
+        except NotImplementedError:
+            # Signal handlers are not implemented on some platforms (e.g., Windows)
+            pass
+
+        runners = [asyncio.create_task(self._run_worker(worker)) for worker in range(len(self.shards))]
+        stopping = asyncio.create_task(self.stopping.wait())
+        done, _ = await asyncio.wait([stopping, *runners], return_when=asyncio.FIRST_COMPLETED)
+        # runners only return once stopping, so any which finished before then have failed
+        failed = next((runner for runner in runners if runner in done), None)
+        if failed is None:
+            log.info("Received signal to terminate, stopping workers.")
+        else:
+            log.error("A worker runner failed, stopping every worker.")
+            self.stopping.set()
+
+        await self._stop_workers()
+        await asyncio.gather(*runners, return_exceptions=True)
+        if failed is not None:
+            # exit with the error, rather than running with a worker which is no longer restarted
+            failed.result()
+
+
+async def supervise(processes: int) -> None:
+    """Run the migrations once, then run the bot's shards across the provided number of worker processes."""
+    if constants.Database.run_migrations:
+        database_engine = create_async_engine(str(constants.Database.postgres_bind))
+        log.info(f"Running database migrations to target {constants.Database.migration_target}")
+        try:
+            await run_alembic(database_engine)
+        finally:
+            await database_engine.dispose()
+
+    shard_count = constants.Client.shard_count or await fetch_recommended_shard_count()
+    log.info(f"Running {shard_count} shards across {min(processes, shard_count)} worker processes.")
+    await Supervisor(shard_count, processes).run()
@@ -4,6 +4,8 @@ import asyncio
 import contextlib
 import datetime
 import functools
+import json
+import time
 from typing import TYPE_CHECKING, Any, TypeVar, cast
 from weakref import WeakValueDictionary
 
@@ -194,3 +196,59 @@ class RedisCache:
 
         async with lock:
             yield
+
+
+class CappedRedisCache:
+    """
+    A redis cache of JSON values which holds at most `max_size` keys, evicting those set longest ago first.
+
+    Every key expires after the timeout, and the prefix itself holds a sorted set of the keys by when they were set,
+    so the oldest can be deleted once the cache is over its size.
+    """
+
+    def __init__(
+        self,
+        redis_session: redis.asyncio.Redis,
+        prefix: str,
+        *,
+        max_size: int,
+        timeout: datetime.timedelta = datetime.timedelta(days=1),
+    ) -> None:
+        self.redis = redis_session
+        self._index_key = constants.Redis.prefix + prefix.rstrip(":")
+        self._max_size = max_size
+        self._redis_timeout = int(timeout.total_seconds())
+
+    def _get_key(self, key: str) -> str:
+        return f"{self._index_key}:{key}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get the value of the provided key, or the default if it isn't cached."""
+        data = await self.redis.get(self._get_key(key))
+        return json.loads(data) if data is not None else default
+
+    async def set(self, key: str, value: Any) -> None:
+        """Set the provided key and value into the cache."""
+        await self.set_many({key: value})
+
+    async def set_many(self, items: dict[str, Any]) -> None:
+        """Set all of the provided keys and values into the cache at once."""
+        if not items:
+            return
+
+        now = time.time()
+        keys = {self._get_key(key): value for key, value in items.items()}
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for key, value in keys.items():
+                pipe.set(key, json.dumps(value), ex=self._redis_timeout)
+            pipe.zadd(self._index_key, dict.fromkeys(keys, now))
+            # forget the keys which have expired by themselves
+            pipe.zremrangebyscore(self._index_key, "-inf", now - self._redis_timeout)
+            pipe.expire(self._index_key, self._redis_timeout)
+            pipe.zcard(self._index_key)
+            *_, count = await pipe.execute()
+
+        if count > self._max_size:
+            evicted = await self.redis.zpopmin(self._index_key, count - self._max_size)
+            if evicted:
+                await self.redis.delete(*(key for key, _ in evicted))
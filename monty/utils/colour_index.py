@@ -0,0 +1,97 @@
+"""
+Nearest named colour lookups.
+
+Colours are compared in CIELAB, where the euclidean distance between two colours roughly matches how different they
+look, unlike in RGB. The named colours are kept in a k-d tree, so finding the nearest only visits a few of them.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, NamedTuple
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+# D65 reference white, as used by sRGB
+_WHITE = (0.95047, 1.0, 1.08883)
+
+
+def _linearize(channel: int) -> float:
+    value = channel / 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _lab_f(t: float) -> float:
+    return t ** (1 / 3) if t > (6 / 29) ** 3 else t / (3 * (6 / 29) ** 2) + 4 / 29
+
+
+def rgb_to_lab(rgb: tuple[int, int, int]) -> tuple[float, float, float]:
+    """Convert sRGB values to CIELAB values."""
+    r, g, b = (_linearize(channel) for channel in rgb)
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / _WHITE[0]
+    y = (0.2126729 * r + 0.7151522 * g + 0.0721750 * b) / _WHITE[1]
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / _WHITE[2]
+    fx, fy, fz = _lab_f(x), _lab_f(y), _lab_f(z)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+class _Node(NamedTuple):
+    lab: tuple[float, float, float]
+    name: str
+    axis: int
+    left: _Node | None
+    right: _Node | None
+
+
+class ColourIndex:
+    """A k-d tree of named colours in CIELAB, for finding the named colour nearest to any colour."""
+
+    def __init__(self, colours: Mapping[str, tuple[int, int, int]]) -> None:
+        self._root = self._build([(rgb_to_lab(rgb), name) for name, rgb in colours.items()], 0)
+        self._size = len(colours)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def _build(cls, points: list[tuple[tuple[float, float, float], str]], depth: int) -> _Node | None:
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda point: point[0][axis])
+        median = len(points) // 2
+        lab, name = points[median]
+        return _Node(
+            lab,
+            name,
+            axis,
+            cls._build(points[:median], depth + 1),
+            cls._build(points[median + 1 :], depth + 1),
+        )
+
+    def nearest(self, rgb: tuple[int, int, int]) -> str | None:
+        """Return the name of the colour nearest to the provided colour, or None if there are no colours."""
+        target = rgb_to_lab(rgb)
+        best_distance = math.inf
+        best_name: str | None = None
+
+        def visit(node: _Node | None) -> None:
+            nonlocal best_distance, best_name
+            if node is None:
+                return
+            distance = sum((a - b) ** 2 for a, b in zip(node.lab, target, strict=True))
+            if distance < best_distance:
+                best_distance, best_name = distance, node.name
+
+            offset = target[node.axis] - node.lab[node.axis]
+            near, far = (node.left, node.right) if offset < 0 else (node.right, node.left)
+            visit(near)
+            # the other side can only hold a nearer colour if the splitting plane is nearer than the best so far
+            if offset**2 < best_distance:
+                visit(far)
+
+        visit(self._root)
+        return best_name
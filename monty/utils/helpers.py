@@ -36,16 +36,6 @@ def suppress_links(message: str) -> str:
     return message
 
 
-def find_nth_occurrence(string: str, substring: str, n: int) -> int | None:
-    """Return index of `n`th occurrence of `substring` in `string`, or None if not found."""
-    index = 0
-    for _ in range(n):
-        index = string.find(substring, index + 1)
-        if index == -1:
-            return None
-    return index
-
-
 def get_num_suffix(num: int) -> str:
     """Get the suffix for the provided number. Currently a lazy implementation so this only supports 1-20."""
     if num == 1:
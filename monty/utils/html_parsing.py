@@ -1,17 +1,16 @@
 from __future__ import annotations
 
 import re
-import string
 import textwrap
 from typing import TYPE_CHECKING, NamedTuple
 
-from bs4.element import NavigableString, PageElement, Tag
+from bs4.element import NavigableString, Tag
 
 from monty.exts.info.docs import MAX_SIGNATURE_AMOUNT
 from monty.exts.info.docs._html import get_dd_description, get_general_description, get_signatures
 from monty.log import get_logger
-from monty.utils.helpers import find_nth_occurrence
 from monty.utils.markdown import DocMarkdownConverter
+from monty.utils.truncation import get_truncated_description
 
 
 if TYPE_CHECKING:
@@ -37,9 +36,6 @@ _NO_SIGNATURE_GROUPS = {
 _EMBED_CODE_BLOCK_LINE_LENGTH = 61
 # _MAX_SIGNATURE_AMOUNT code block wrapped lines with py syntax highlight
 _MAX_SIGNATURES_LENGTH = (_EMBED_CODE_BLOCK_LINE_LENGTH + 8) * MAX_SIGNATURE_AMOUNT
-# Maximum embed description length - signatures on top
-_MAX_DESCRIPTION_LENGTH = 4096 - _MAX_SIGNATURES_LENGTH
-_TRUNCATE_STRIP_CHARACTERS = "!?:;." + string.whitespace
 
 
 class BracketPair(NamedTuple):
@@ -141,112 +137,6 @@ def _truncate_signatures(signatures: Collection[str]) -> list[str] | Collection[
     return formatted_signatures
 
 
-def _get_truncated_description(
-    elements: Iterable[Tag | NavigableString | PageElement] | Tag,
-    markdown_converter: DocMarkdownConverter,
-    max_length: int,
-    max_lines: int,
-) -> str:
-    """
-    Truncate the Markdown from `elements` to be at most `max_length` characters when rendered or `max_lines` newlines.
-
-    `max_length` limits the length of the rendered characters in the string,
-    with the real string length limited to `_MAX_DESCRIPTION_LENGTH` to accommodate discord length limits.
-    """
-    result = ""
-    markdown_element_ends = []  # Stores indices into `result` which point to the end boundary of each Markdown element.
-    rendered_length = 0
-
-    tag_end_index = 0
-
-    for element in elements:
-        is_tag = isinstance(element, Tag)
-        is_page_element = isinstance(element, PageElement)
-        if is_tag:
-            # remove links in headers
-            # see also https://github.com/sphinx-doc/sphinx/blob/ba7408209e84ee413f240afc20f3c6b484a81f8f/sphinx/themes/basic/static/searchtools.js#L157
-            for link in element.select(".headerlink"):
-                link.decompose()
-
-            element_length = len(element.text)
-        elif is_page_element:
-            element_length = 0
-        else:
-            element_length = len(element)
-
-        if rendered_length + element_length >= max_length:
-            break
-        if is_tag:
-            element_markdown = markdown_converter.process_tag(element)
-        else:
-            element_markdown = markdown_converter.process_text(element)
-
-        rendered_length += element_length
-        tag_end_index += len(element_markdown)
-
-        if not element_markdown.isspace():
-            markdown_element_ends.append(tag_end_index)
-        result += element_markdown
-
-    if not markdown_element_ends:
-        return ""
-
-    # Determine the "hard" truncation index. Account for the ellipsis placeholder for the max length.
-    newline_truncate_index = find_nth_occurrence(result, "\n", max_lines)
-    if newline_truncate_index is not None and newline_truncate_index < _MAX_DESCRIPTION_LENGTH - 3:
-        # Truncate based on maximum lines if there are more than the maximum number of lines.
-        truncate_index = newline_truncate_index
-        truncate_by_newlines = True
-    else:
-        # There are less than the maximum number of lines; truncate based on the max char length.
-        truncate_index = _MAX_DESCRIPTION_LENGTH - 3
-        truncate_by_newlines = False
-
-    # Nothing needs to be truncated if the last element ends before the truncation index.
-    if truncate_index >= markdown_element_ends[-1]:
-        return result
-
-    # try to cut a list in the middle if there is a list, and change the end to cont
-
-    # keep lists if they exist, removing the last items until its short.
-    # this is a tad hacky but it should work
-    if truncate_by_newlines:
-        result = result.rstrip()
-        if split := result.rsplit("\n"):
-            while split and split[-1].startswith("|") and split[-1].endswith("|") and len(split) > max_lines:
-                split.pop()
-
-        result = "\n".join(split)
-        result += "\n<continued...>"
-        if result.count("\n") <= max_lines:
-            return result
-
-    # Determine the actual truncation index.
-    possible_truncation_indices = [cut for cut in markdown_element_ends if cut < truncate_index]
-    if not possible_truncation_indices:
-        # In case there is no Markdown element ending before the truncation index, try to find a good cutoff point.
-        force_truncated = result[:truncate_index]
-        # If there is an incomplete codeblock, cut it out.
-        if force_truncated.count("```") % 2:
-            force_truncated = force_truncated[: force_truncated.rfind("```")]
-        # Search for substrings to truncate at, with decreasing desirability.
-        for string_ in ("\n\n", "\n", ". ", ", ", ",", " "):
-            cutoff = force_truncated.rfind(string_)
-
-            if cutoff != -1:
-                truncated_result = force_truncated[:cutoff]
-                break
-        else:
-            truncated_result = force_truncated
-
-    else:
-        # Truncate at the last Markdown element that comes before the truncation index.
-        markdown_truncate_index = possible_truncation_indices[-1]
-        truncated_result = result[:markdown_truncate_index]
-
-    return truncated_result.strip(_TRUNCATE_STRIP_CHARACTERS) + "..."
-
-
 def _create_markdown(signatures: list[str] | None, description: Iterable[Tag | NavigableString], url: str) -> str:
     """
     Create a Markdown string with the signatures at the top, and the converted html description below them.
@@ -254,7 +144,7 @@ def _create_markdown(signatures: list[str] | None, description: Iterable[Tag | N
     The signatures are wrapped in python codeblocks, separated from the description by a newline.
     The result Markdown string is max 750 rendered characters for the description with signatures at the start.
     """
-    description_str = _get_truncated_description(
+    description_str = get_truncated_description(
         description, markdown_converter=DocMarkdownConverter(bullets="•", page_url=url), max_length=750, max_lines=13
     )
     description_str = _WHITESPACE_AFTER_NEWLINES_RE.sub("", description_str)
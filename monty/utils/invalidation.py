@@ -0,0 +1,168 @@
+"""
+Cross-process cache invalidation over redis pub/sub.
+
+Each process keeps its own in-memory caches, such as guild configs, features, and documentation inventories.
+When one process changes the data behind one of those caches, it publishes an `Invalidation` so every other process
+can drop or reload its copy, instead of serving stale data until it happens to refetch it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import enum
+import json
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from attrs import define
+
+from monty import constants
+from monty.log import get_logger
+from monty.utils import scheduling
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    import redis.asyncio
+
+    InvalidationHandler = Callable[["Invalidation"], Awaitable[None]]
+
+
+log = get_logger(__name__)
+
+CHANNEL = f"{constants.Redis.prefix}invalidations"
+# Seconds to wait before resubscribing after losing the connection to redis
+RECONNECT_DELAY = 5
+
+
+class InvalidationKind(enum.Enum):
+    """The caches which can be invalidated, and what their invalidation key is."""
+
+    # key: guild id
+    GUILD = "guild"
+    # key: guild id
+    GUILD_CONFIG = "guild_config"
+    # key: feature name, or None for every feature and rollout
+    FEATURES = "features"
+    # key: package name, or None for every inventory
+    DOCS_INVENTORY = "docs_inventory"
+    # key: None
+    DOCS_WHITELIST = "docs_whitelist"
+    # key: None
+    PYPI_PACKAGES = "pypi_packages"
+
+
+@define(frozen=True)
+class Invalidation:
+    """A message that a cache in other processes is outdated."""
+
+    kind: InvalidationKind
+    key: str | int | None = None
+    origin: str = ""
+
+    def dumps(self) -> str:
+        """Serialise this invalidation to be published."""
+        return json.dumps({"kind": self.kind.value, "key": self.key, "origin": self.origin})
+
+    @classmethod
+    def loads(cls, data: str | bytes) -> Invalidation:
+        """Deserialise a published invalidation."""
+        payload: dict[str, Any] = json.loads(data)
+        return cls(kind=InvalidationKind(payload["kind"]), key=payload.get("key"), origin=payload.get("origin", ""))
+
+
+class InvalidationBus:
+    """
+    Publishes invalidations and dispatches those from other processes to the subscribed cache owners.
+
+    Invalidations published by this process are not dispatched back to it, as the publisher has already updated
+    its own caches.
+    """
+
+    def __init__(self, redis_session: redis.asyncio.Redis, *, channel: str = CHANNEL) -> None:
+        self.redis = redis_session
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._handlers: dict[InvalidationKind, list[InvalidationHandler]] = {}
+        self._listener: asyncio.Task[None] | None = None
+
+    def subscribe(self, kind: InvalidationKind, handler: InvalidationHandler) -> None:
+        """Call `handler` whenever another process publishes an invalidation of the provided kind."""
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def unsubscribe(self, kind: InvalidationKind, handler: InvalidationHandler) -> None:
+        """Remove a handler added with `subscribe`, if it is subscribed."""
+        handlers = self._handlers.get(kind, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    async def publish(self, kind: InvalidationKind, key: str | int | None = None) -> None:
+        """Tell every other process that the provided cache entry is outdated."""
+        invalidation = Invalidation(kind, key, origin=self.origin)
+        try:
+            await self.redis.publish(self.channel, invalidation.dumps())
+        except Exception:
+            log.exception(f"Could not publish invalidation {invalidation!r}.")
+
+    def publish_after(
+        self, awaitable: Awaitable[Any], kind: InvalidationKind, key: str | int | None = None
+    ) -> asyncio.Task[None]:
+        """Publish an invalidation once `awaitable`, such as a queued database write, has completed successfully."""
+
+        async def publish_when_done() -> None:
+            try:
+                await awaitable
+            except Exception:
+                # other processes still hold the same data as the database, so there is nothing to invalidate
+                log.exception(f"Not publishing invalidation {kind.value} {key!r}, as the write before it failed.")
+                return
+            await self.publish(kind, key)
+
+        return scheduling.create_task(publish_when_done(), name=f"publish-invalidation-{kind.value}")
+
+    def start(self) -> None:
+        """Start listening for invalidations from other processes."""
+        if self._listener is None or self._listener.done():
+            self._listener = scheduling.create_task(self._listen(), name="invalidation-bus")
+
+    async def close(self) -> None:
+        """Stop listening for invalidations."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            await self._receive()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _receive(self) -> None:
+        """Subscribe, and dispatch invalidations until the subscription is lost."""
+        try:
+            async with self.redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(self.channel)
+                log.debug(f"Listening for cache invalidations on {self.channel}.")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._dispatch(message["data"])
+        except Exception:
+            log.exception(f"Lost the invalidation subscription, resubscribing in {RECONNECT_DELAY} seconds.")
+
+    def _dispatch(self, data: str | bytes) -> None:
+        try:
+            invalidation = Invalidation.loads(data)
+        except (ValueError, KeyError, TypeError):
+            log.warning(f"Received a malformed invalidation: {data!r}")
+            return
+
+        if invalidation.origin == self.origin:
+            return
+
+        log.debug(f"Received invalidation {invalidation!r}.")
+        for handler in self._handlers.get(invalidation.kind, ()):
+            scheduling.create_task(handler(invalidation), name=f"invalidation-{invalidation.kind.value}")
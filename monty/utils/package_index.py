@@ -0,0 +1,338 @@
+"""
+A search index over every package name on PyPI, for autocomplete.
+
+Fuzzy matching a query against every one of the several hundred thousand package names takes far too long to do on
+each keystroke. Instead, names are normalised per PEP 503 and kept sorted, so names starting with the query are found
+with a binary search, and a trigram index finds names sharing the largest share of their trigrams with the query.
+Typos such as swapped letters break most of a short query's trigrams, so names starting with the query with one
+letter dropped or two adjacent letters swapped are looked up as well. Only that bounded set of candidates is then
+scored with rapidfuzz.
+
+The index is written to a file in a flat format which is memory-mapped, so it loads instantly, and every process
+on the host shares the same pages rather than holding its own copy of every name.
+
+The simple index itself is parsed as it is downloaded, and names are cached as a compressed newline-delimited blob,
+so that the full index never has to be held in memory as parsed JSON.
+"""
+
+from __future__ import annotations
+
+import bisect
+import codecs
+import collections
+import heapq
+import io
+import json
+import mmap
+import os
+import pathlib
+import re
+import struct
+import zlib
+from array import array
+from typing import TYPE_CHECKING, BinaryIO
+
+import rapidfuzz.distance
+import rapidfuzz.process
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from typing_extensions import Buffer as ReadableBuffer
+
+
+# https://peps.python.org/pep-0503/#normalized-names
+_NORMALIZE_RE = re.compile(r"[-_.]+")
+# https://peps.python.org/pep-0691/#project-list
+_PROJECTS_RE = re.compile(r'"projects"\s*:\s*\[')
+_SEPARATOR_RE = re.compile(r"[\s,]*")
+
+NGRAM_SIZE = 3
+# Upper bound on the number of names starting with the query which are scored
+MAX_PREFIX_CANDIDATES = 250
+# Upper bound on the number of names starting with each misspelling of the query which are scored
+MAX_TYPO_CANDIDATES = 25
+# Upper bound on the number of names sharing trigrams with the query which are scored
+MAX_NGRAM_CANDIDATES = 2_000
+# Trigrams shared by more names than this are too common to narrow the search, and are skipped when possible
+MAX_POSTINGS = 40_000
+
+# magic, format version, when the names were fetched, number of names, number of trigrams
+_HEADER = struct.Struct("=4sIdII")
+_MAGIC = b"MPNI"
+_VERSION = 1
+_EMPTY_INDEX = _HEADER.pack(_MAGIC, _VERSION, 0.0, 0, 0) + bytes(16)
+
+
+def normalize_name(name: str) -> str:
+    """Normalise a package name as per PEP 503."""
+    return _NORMALIZE_RE.sub("-", name).lower()
+
+
+def dump_names(names: Iterable[str]) -> bytes:
+    """Compress package names into a newline-delimited blob, for storing in redis."""
+    return zlib.compress("\n".join(names).encode())
+
+
+def load_names(blob: bytes) -> list[str]:
+    """Decompress package names stored with `dump_names`."""
+    text = zlib.decompress(blob).decode()
+    return text.split("\n") if text else []
+
+
+def _ngrams(name: str) -> set[str]:
+    return {name[i : i + NGRAM_SIZE] for i in range(len(name) - NGRAM_SIZE + 1)}
+
+
+def _typos(key: str) -> set[str]:
+    """Return the key with each letter dropped, and with each pair of adjacent letters swapped."""
+    typos = {key[:i] + key[i + 1 :] for i in range(len(key))}
+    typos.update(key[:i] + key[i + 1] + key[i] + key[i + 2 :] for i in range(len(key) - 1))
+    typos.discard(key)
+    typos.discard("")
+    return typos
+
+
+class SimpleIndexParser:
+    """
+    Incrementally parses the names of every project out of the JSON form of the simple index, as it is downloaded.
+
+    Only the project currently being received is buffered, rather than the whole response.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._in_projects = False
+        self.done = False
+
+    def feed(self, data: bytes) -> list[str]:
+        """Parse the next chunk of the response, and return the names of the projects it completed."""
+        buffer = self._buffer + self._decoder.decode(data)
+        names: list[str] = []
+        pos = 0
+        if not self._in_projects:
+            match = _PROJECTS_RE.search(buffer)
+            if match is None:
+                # the project list comes after the short metadata object, so this stays small
+                self._buffer = buffer
+                return names
+            self._in_projects = True
+            pos = match.end()
+
+        while not self.done:
+            pos = _SEPARATOR_RE.match(buffer, pos).end()  # type: ignore[union-attr]
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.done = True
+                break
+            try:
+                project, pos = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # the rest of this project has not been received yet
+                break
+            names.append(project["name"])
+
+        self._buffer = buffer[pos:]
+        return names
+
+    def close(self) -> None:
+        """Check the whole project list was received."""
+        if not self.done:
+            msg = "The simple index ended before the end of its project list."
+            raise ValueError(msg)
+
+
+class _Strings:
+    """A read-only sequence of the byte strings in `data`, where string `i` spans `offsets[i]:offsets[i + 1]`."""
+
+    def __init__(self, data: memoryview, offsets: memoryview) -> None:
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return bytes(self._data[self._offsets[index] : self._offsets[index + 1]])
+
+    def size(self, index: int) -> int:
+        """Return the length of string `index` without copying it."""
+        return self._offsets[index + 1] - self._offsets[index]
+
+
+def _write_strings(file: BinaryIO, strings: list[bytes]) -> None:
+    """Write the offset table of the provided strings, followed by the strings padded to a multiple of 4 bytes."""
+    offsets = array("I", [0])
+    for string in strings:
+        offsets.append(offsets[-1] + len(string))
+    file.write(offsets)
+    file.write(b"".join(strings))
+    file.write(bytes(-offsets[-1] % 4))
+
+
+class PackageNameIndex:
+    """
+    A prefix and trigram index over package names, stored in a flat binary format which can be memory-mapped.
+
+    The format is a header, followed by the normalised names sorted for prefix lookups, the display name of each,
+    the sorted trigrams, and the postings of each trigram, which are the indexes of every name containing it. Each
+    of those is an offset table followed by the data it points into, so lookups read directly from the buffer,
+    and processes mapping the same file share its pages instead of each deserialising every name.
+    """
+
+    def __init__(self, data: ReadableBuffer | None = None) -> None:
+        self._buffer = memoryview(data or _EMPTY_INDEX)
+        magic, version, self.fetched_at, name_count, gram_count = _HEADER.unpack_from(self._buffer)
+        if magic != _MAGIC or version != _VERSION:
+            msg = "The buffer is not a package name index, or was written by an incompatible version."
+            raise ValueError(msg)
+
+        pos = _HEADER.size
+        self._keys, pos = self._read_strings(pos, name_count)
+        self._names, pos = self._read_strings(pos, name_count)
+        self._grams, pos = self._read_strings(pos, gram_count)
+        posting_offsets, pos = self._read_offsets(pos, gram_count)
+        self._postings = self._buffer[pos : pos + posting_offsets[-1] * 4].cast("I")
+        self._posting_offsets = posting_offsets
+
+    def _read_offsets(self, pos: int, count: int) -> tuple[memoryview, int]:
+        end = pos + (count + 1) * 4
+        return self._buffer[pos:end].cast("I"), end
+
+    def _read_strings(self, pos: int, count: int) -> tuple[_Strings, int]:
+        offsets, pos = self._read_offsets(pos, count)
+        end = pos + offsets[-1]
+        return _Strings(self._buffer[pos:end], offsets), end + (-end % 4)
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> PackageNameIndex:
+        """Memory-map the index written to the provided file."""
+        with pathlib.Path(path).open("rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], *, fetched_at: float = 0.0) -> PackageNameIndex:
+        """Build an index of the provided names in memory."""
+        file = io.BytesIO()
+        cls._write(file, names, fetched_at=fetched_at)
+        return cls(file.getbuffer())
+
+    @classmethod
+    def write(cls, path: str | os.PathLike[str], names: Iterable[str], *, fetched_at: float) -> None:
+        """
+        Write an index of the provided names to the provided file.
+
+        The file is replaced atomically, so processes which mapped the previous index can keep using it.
+        """
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with temp.open("wb") as file:
+                cls._write(file, names, fetched_at=fetched_at)
+            temp.replace(path)
+        finally:
+            temp.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write(file: BinaryIO, names: Iterable[str], *, fetched_at: float) -> None:
+        by_key: dict[str, str] = {}
+        for name in names:
+            by_key.setdefault(normalize_name(name), name)
+        # code point order is the same as the order of the UTF-8 encoded names, which is what lookups compare
+        keys = sorted(by_key)
+
+        postings: dict[str, array[int]] = {}
+        for index, key in enumerate(keys):
+            for gram in _ngrams(key):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(index)
+        grams = sorted(postings)
+
+        file.write(_HEADER.pack(_MAGIC, _VERSION, fetched_at, len(keys), len(grams)))
+        _write_strings(file, [key.encode() for key in keys])
+        _write_strings(file, [by_key[key].encode() for key in keys])
+        _write_strings(file, [gram.encode() for gram in grams])
+        posting_offsets = array("I", [0])
+        for gram in grams:
+            posting_offsets.append(posting_offsets[-1] + len(postings[gram]))
+        file.write(posting_offsets)
+        for gram in grams:
+            file.write(postings[gram])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        key = normalize_name(name).encode()
+        index = bisect.bisect_left(self._keys, key)
+        return index < len(self._keys) and self._keys[index] == key
+
+    def _prefix_candidates(self, key: bytes, limit: int = MAX_PREFIX_CANDIDATES) -> range:
+        start = bisect.bisect_left(self._keys, key)
+        # every name starting with the key sorts before the key followed by a byte which never occurs in UTF-8
+        limit = min(len(self._keys), start + limit)
+        end = bisect.bisect_left(self._keys, key + b"\xff", start, limit)
+        return range(start, end)
+
+    def _posting(self, gram: str) -> memoryview | None:
+        encoded = gram.encode()
+        index = bisect.bisect_left(self._grams, encoded)
+        if index == len(self._grams) or self._grams[index] != encoded:
+            return None
+        return self._postings[self._posting_offsets[index] : self._posting_offsets[index + 1]]
+
+    def _ngram_candidates(self, key: str) -> list[int]:
+        grams = _ngrams(key)
+        postings = sorted(filter(None, map(self._posting, grams)), key=len)
+        if not postings:
+            return []
+
+        # always use the rarest trigram, even if it is common, so there is at least something to go on
+        selective = [p for p in postings if len(p) <= MAX_POSTINGS] or postings[:1]
+        counts: collections.Counter[int] = collections.Counter()
+        for posting in selective:
+            counts.update(posting)
+
+        # a raw count favours long names which happen to contain the query's trigrams, and ties between the many names
+        # sharing as many of them would be cut arbitrarily, so rank by the share of trigrams in common instead
+        def similarity(item: tuple[int, int]) -> float:
+            index, shared = item
+            name_grams = max(self._keys.size(index) - NGRAM_SIZE + 1, 1)
+            return shared / (len(grams) + name_grams - shared)
+
+        ranked = heapq.nlargest(MAX_NGRAM_CANDIDATES, counts.items(), key=similarity)
+        return [index for index, _ in ranked]
+
+    def _typo_candidates(self, key: str) -> list[int]:
+        candidates: list[int] = []
+        for typo in _typos(key):
+            candidates.extend(self._prefix_candidates(typo.encode(), MAX_TYPO_CANDIDATES))
+        return candidates
+
+    def search(self, query: str, *, limit: int = 25, score_cutoff: float = 0.4) -> list[str]:
+        """Return the display names of up to `limit` packages which best match the query, best first."""
+        key = normalize_name(query)
+        if not key or not self:
+            return []
+
+        candidates = dict.fromkeys(self._prefix_candidates(key.encode()))
+        candidates.update(dict.fromkeys(self._typo_candidates(key)))
+        candidates.update(dict.fromkeys(self._ngram_candidates(key)))
+
+        results = rapidfuzz.process.extract(
+            key,
+            {index: self._keys[index].decode() for index in candidates},
+            scorer=rapidfuzz.distance.JaroWinkler.similarity,
+            limit=limit,
+            score_cutoff=score_cutoff,
+        )
+        return [self._names[index].decode() for _, _, index in results]
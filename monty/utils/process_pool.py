@@ -0,0 +1,77 @@
+"""
+A process pool for CPU-bound jobs which would otherwise block the event loop.
+
+Unlike threads, worker processes are not limited by the GIL, and a job which runs over its time budget can be stopped
+by terminating its worker, which is then replaced on the next job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from monty.log import get_logger
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+T = TypeVar("T")
+
+log = get_logger(__name__)
+
+
+class ProcessPool:
+    """
+    Runs jobs in worker processes, each with a time budget.
+
+    Workers are spawned rather than forked from the bot, so they do not inherit its event loop, threads, or
+    connections. Jobs must be picklable module-level functions.
+    """
+
+    def __init__(self, *, max_workers: int = 2) -> None:
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: float) -> T:
+        """
+        Run the job in a worker process, and return its result.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            The job did not finish within `timeout` seconds, and was stopped.
+        concurrent.futures.process.BrokenProcessPool
+            The worker running the job died, such as when the pool was restarted to stop another job.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), functools.partial(func, *args))
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"{func.__qualname__} ran for more than {timeout} seconds, restarting the process pool.")
+            self.restart()
+            raise
+
+    def restart(self) -> None:
+        """Stop every worker, and any jobs they are running, so that a new pool is started for the next job."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # running jobs cannot be cancelled, so their workers have to be terminated
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop every worker without waiting for running jobs to finish."""
+        self.restart()
@@ -1,4 +1,5 @@
 import datetime
+import functools
 import hashlib
 import math
 import random
@@ -76,6 +77,21 @@ def find_new_hash_levels(rollout: Rollout, goal_percent: float) -> tuple[int, in
     return low, high
 
 
+@functools.lru_cache(maxsize=16_384)
+def get_rollout_bucket(id: int, *, rollout_id: int | None, rollout_name: str) -> int:
+    """
+    Return the bucket, from 0 to 9999, that the provided Discord ID falls into for a rollout.
+
+    Buckets never change for a given rollout and ID, so they are memoized.
+    """
+    to_hash = rollout_name + ":" + str(id)
+    if rollout_id is not None:
+        to_hash = str(rollout_id) + ":" + to_hash
+
+    rollout_hash = hashlib.sha256(to_hash.encode()).hexdigest()
+    return int(rollout_hash, 16) % 10_000
+
+
 def is_rolled_out_to(id: int, *, rollout: Rollout, include_rollout_id: bool = True) -> bool:
     """
     Check if the provided rollout is rolled out to the provided Discord ID.
@@ -83,10 +99,9 @@ def is_rolled_out_to(id: int, *, rollout: Rollout, include_rollout_id: bool = Tr
     This method hashes the rollout name with the ID and checks if the result
     is within hash_low and hash_high.
     """
-    to_hash = rollout.name + ":" + str(id)
-    if include_rollout_id:
-        to_hash = str(rollout.id) + ":" + to_hash
-
-    rollout_hash = hashlib.sha256(to_hash.encode()).hexdigest()
-    hash_int = int(rollout_hash, 16)
-    return (hash_int % 10_000) in range(rollout.rollout_hash_low, rollout.rollout_hash_high)
+    bucket = get_rollout_bucket(
+        id,
+        rollout_id=rollout.id if include_rollout_id else None,
+        rollout_name=rollout.name,
+    )
+    return rollout.rollout_hash_low <= bucket < rollout.rollout_hash_high
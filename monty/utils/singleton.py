@@ -0,0 +1,130 @@
+"""
+Election of a single bot process to run jobs which must only run once across every process.
+
+The elected process holds a lease in redis, which it renews while it is alive. When it stops renewing the lease,
+such as after a crash, another process takes over once the lease expires. A bot running as a single process is
+always elected, without a lease.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from monty import constants
+from monty.log import get_logger
+from monty.utils import scheduling
+
+
+if TYPE_CHECKING:
+    import redis.asyncio
+
+
+log = get_logger(__name__)
+
+LEASE_KEY = f"{constants.Redis.prefix}singleton-lease"
+LEASE_TIMEOUT = timedelta(seconds=30)
+
+# only extend or release the lease if this process still holds it
+_RENEW_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class SingletonElection:
+    """Elects one process, out of every process sharing the redis server, to run singleton jobs."""
+
+    def __init__(
+        self,
+        redis_session: redis.asyncio.Redis,
+        identity: str,
+        *,
+        key: str = LEASE_KEY,
+        timeout: timedelta = LEASE_TIMEOUT,
+        standalone: bool = False,
+    ) -> None:
+        self.redis = redis_session
+        self.identity = identity
+        self.key = key
+        # the only process, so there is nothing to elect
+        self.standalone = standalone
+        self._timeout_ms = int(timeout.total_seconds() * 1000)
+        # the local deadline by which the lease must be renewed, to account for slow renewals
+        self._lease_expires = 0.0
+        self._decided = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_elected(self) -> bool:
+        """Whether this process currently holds the lease."""
+        return self.standalone or time.monotonic() < self._lease_expires
+
+    async def wait_until_elected(self) -> bool:
+        """Wait for the first election to finish, and return whether this process was elected."""
+        if self.standalone:
+            return True
+        await self._decided.wait()
+        return self.is_elected
+
+    def start(self) -> None:
+        """Start taking part in the election."""
+        if self.standalone:
+            return
+        if self._task is None or self._task.done():
+            self._task = scheduling.create_task(self._run(), name="singleton-election")
+
+    async def close(self) -> None:
+        """Stop taking part in the election, releasing the lease if it is held."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if not self.standalone and self.is_elected:
+            self._lease_expires = 0.0
+            try:
+                await self.redis.eval(_RELEASE_SCRIPT, 1, self.key, self.identity)
+            except Exception:
+                log.exception("Could not release the singleton lease.")
+
+    async def _run(self) -> None:
+        while True:
+            was_elected = self.is_elected
+            try:
+                await self._campaign()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Could not acquire or renew the singleton lease.")
+            finally:
+                self._decided.set()
+
+            if self.is_elected != was_elected:
+                log.info("Elected to run singleton jobs." if self.is_elected else "No longer running singleton jobs.")
+            await asyncio.sleep(self._timeout_ms / 1000 / 3)
+
+    async def _campaign(self) -> None:
+        started = time.monotonic()
+        if self.is_elected:
+            held = await self.redis.eval(_RENEW_SCRIPT, 1, self.key, self.identity, self._timeout_ms)
+        else:
+            held = await self.redis.set(self.key, self.identity, nx=True, px=self._timeout_ms)
+
+        if held:
+            self._lease_expires = started + self._timeout_ms / 1000
+        else:
+            self._lease_expires = 0.0
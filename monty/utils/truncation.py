@@ -0,0 +1,141 @@
+"""
+Truncation of rendered HTML to fit in Discord messages.
+
+This is kept apart from the documentation parsing, as it also runs in worker processes which should only load what
+rendering needs.
+"""
+
+from __future__ import annotations
+
+import string
+from typing import TYPE_CHECKING
+
+from bs4.element import NavigableString, PageElement, Tag
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from monty.utils.markdown import DocMarkdownConverter
+
+
+# Embed description limit, leaving room for the signatures shown above the description of a documented symbol,
+# which are up to 3 code blocks of 61 characters per line, see monty.utils.html_parsing
+MAX_DESCRIPTION_LENGTH = 4096 - (61 + 8) * 3
+_TRUNCATE_STRIP_CHARACTERS = "!?:;." + string.whitespace
+
+
+def find_nth_occurrence(string: str, substring: str, n: int) -> int | None:
+    """Return index of `n`th occurrence of `substring` in `string`, or None if not found."""
+    index = 0
+    for _ in range(n):
+        index = string.find(substring, index + 1)
+        if index == -1:
+            return None
+    return index
+
+
+def get_truncated_description(
+    elements: Iterable[Tag | NavigableString | PageElement] | Tag,
+    markdown_converter: DocMarkdownConverter,
+    max_length: int,
+    max_lines: int,
+) -> str:
+    """
+    Truncate the Markdown from `elements` to be at most `max_length` characters when rendered or `max_lines` newlines.
+
+    `max_length` limits the length of the rendered characters in the string,
+    with the real string length limited to `MAX_DESCRIPTION_LENGTH` to accommodate discord length limits.
+    """
+    result = ""
+    markdown_element_ends = []  # Stores indices into `result` which point to the end boundary of each Markdown element.
+    rendered_length = 0
+
+    tag_end_index = 0
+
+    for element in elements:
+        is_tag = isinstance(element, Tag)
+        is_page_element = isinstance(element, PageElement)
+        if is_tag:
+            # remove links in headers
+            # see also https://github.com/sphinx-doc/sphinx/blob/ba7408209e84ee413f240afc20f3c6b484a81f8f/sphinx/themes/basic/static/searchtools.js#L157
+            for link in element.select(".headerlink"):
+                link.decompose()
+
+            element_length = len(element.text)
+        elif is_page_element:
+            element_length = 0
+        else:
+            element_length = len(element)
+
+        if rendered_length + element_length >= max_length:
+            break
+        if is_tag:
+            element_markdown = markdown_converter.process_tag(element)
+        else:
+            element_markdown = markdown_converter.process_text(element)
+
+        rendered_length += element_length
+        tag_end_index += len(element_markdown)
+
+        if not element_markdown.isspace():
+            markdown_element_ends.append(tag_end_index)
+        result += element_markdown
+
+    if not markdown_element_ends:
+        return ""
+
+    # Determine the "hard" truncation index. Account for the ellipsis placeholder for the max length.
+    newline_truncate_index = find_nth_occurrence(result, "\n", max_lines)
+    if newline_truncate_index is not None and newline_truncate_index < MAX_DESCRIPTION_LENGTH - 3:
+        # Truncate based on maximum lines if there are more than the maximum number of lines.
+        truncate_index = newline_truncate_index
+        truncate_by_newlines = True
+    else:
+        # There are less than the maximum number of lines; truncate based on the max char length.
+        truncate_index = MAX_DESCRIPTION_LENGTH - 3
+        truncate_by_newlines = False
+
+    # Nothing needs to be truncated if the last element ends before the truncation index.
+    if truncate_index >= markdown_element_ends[-1]:
+        return result
+
+    # try to cut a list in the middle if there is a list, and change the end to cont
+
+    # keep lists if they exist, removing the last items until its short.
+    # this is a tad hacky but it should work
+    if truncate_by_newlines:
+        result = result.rstrip()
+        if split := result.rsplit("\n"):
+            while split and split[-1].startswith("|") and split[-1].endswith("|") and len(split) > max_lines:
+                split.pop()
+
+        result = "\n".join(split)
+        result += "\n<continued...>"
+        if result.count("\n") <= max_lines:
+            return result
+
+    # Determine the actual truncation index.
+    possible_truncation_indices = [cut for cut in markdown_element_ends if cut < truncate_index]
+    if not possible_truncation_indices:
+        # In case there is no Markdown element ending before the truncation index, try to find a good cutoff point.
+        force_truncated = result[:truncate_index]
+        # If there is an incomplete codeblock, cut it out.
+        if force_truncated.count("```") % 2:
+            force_truncated = force_truncated[: force_truncated.rfind("```")]
+        # Search for substrings to truncate at, with decreasing desirability.
+        for string_ in ("\n\n", "\n", ". ", ", ", ",", " "):
+            cutoff = force_truncated.rfind(string_)
+
+            if cutoff != -1:
+                truncated_result = force_truncated[:cutoff]
+                break
+        else:
+            truncated_result = force_truncated
+
+    else:
+        # Truncate at the last Markdown element that comes before the truncation index.
+        markdown_truncate_index = possible_truncation_indices[-1]
+        truncated_result = result[:markdown_truncate_index]
+
+    return truncated_result.strip(_TRUNCATE_STRIP_CHARACTERS) + "..."
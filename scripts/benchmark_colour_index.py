@@ -0,0 +1,71 @@
+"""
+Benchmark finding the name of a colour.
+
+Compares the previous fuzzy match of the hex code against every named colour, a linear scan for the nearest named
+colour in CIELAB, and `ColourIndex.nearest`, checking that the index finds the same colour as the linear scan.
+
+    python -m scripts.benchmark_colour_index
+"""
+
+import json
+import pathlib
+import random
+import time
+
+import rapidfuzz.process
+
+from monty.utils.colour_index import ColourIndex, rgb_to_lab
+
+
+COLOURS_FILE = pathlib.Path("monty/resources/ryanzec_colours.json")
+SAMPLES = 2_000
+
+
+def fuzzy_match(mapping: dict[str, str], rgb: tuple[int, int, int]) -> str | None:
+    """Fuzzy match the hex code against every named colour's hex code."""
+    result = rapidfuzz.process.extractOne(
+        query="#" + "".join(f"{value:02X}" for value in rgb), choices=mapping.values(), score_cutoff=80
+    )
+    if result:
+        return next(name for name, hex_code in mapping.items() if hex_code == result[0])
+    return None
+
+
+def linear_scan(labs: list[tuple[tuple[float, float, float], str]], rgb: tuple[int, int, int]) -> str:
+    """Find the nearest named colour by measuring the distance to every one."""
+    target = rgb_to_lab(rgb)
+    return min(labs, key=lambda item: sum((a - b) ** 2 for a, b in zip(item[0], target, strict=True)))[1]
+
+
+def time_us(func: "object", samples: list[tuple[int, int, int]]) -> float:
+    """Return the mean runtime of the function over every sample in microseconds."""
+    start = time.perf_counter()
+    for rgb in samples:
+        func(rgb)  # type: ignore[operator]
+    return (time.perf_counter() - start) / len(samples) * 1_000_000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    with COLOURS_FILE.open() as f:
+        mapping: dict[str, str] = json.load(f)
+    del mapping["_"]
+    colours = {name: tuple(bytes.fromhex(hex_code)) for name, hex_code in mapping.items()}
+    labs = [(rgb_to_lab(rgb), name) for name, rgb in colours.items()]
+
+    start = time.perf_counter()
+    index = ColourIndex(colours)  # type: ignore[arg-type]
+    print(f"{len(index):,} colours, index build: {(time.perf_counter() - start) * 1000:.1f}ms")  # noqa: T201
+
+    rng = random.Random(0)
+    samples = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(SAMPLES)]
+    mismatches = sum(index.nearest(rgb) != linear_scan(labs, rgb) for rgb in samples)
+    print(f"mismatches against the linear scan: {mismatches}/{SAMPLES}")  # noqa: T201
+
+    print(f"fuzzy hex match: {time_us(lambda rgb: fuzzy_match(mapping, rgb), samples):>8.1f}us")  # noqa: T201
+    print(f"linear scan:     {time_us(lambda rgb: linear_scan(labs, rgb), samples):>8.1f}us")  # noqa: T201
+    print(f"k-d tree:        {time_us(index.nearest, samples):>8.1f}us")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
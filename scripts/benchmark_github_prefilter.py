@@ -0,0 +1,124 @@
+"""
+Benchmark the regex prefilter which runs before ghretos parses messages for GitHub resources.
+
+Parses sets of messages with and without GitHub links with the functions `GithubInfo.parse_contents` uses, once
+handing every segment and url to ghretos and once rejecting them with the prefilter first, and checks both find the
+same resources. Repositories are not resolved, as that needs the bot. The auto-responder settings are used, as they
+run on every message and do not match bare usernames.
+
+    python -m scripts.benchmark_github_prefilter
+"""
+
+import random
+import time
+
+import ghretos
+
+from monty.exts.info.github.cog import parse_github_urls, parse_shorthand_segments
+from monty.utils.messages import extract_urls
+
+
+MESSAGES = 5_000
+WORDS = (
+    "the",
+    "bot",
+    "is",
+    "down",
+    "again",
+    "anyone",
+    "know",
+    "why",
+    "my",
+    "code",
+    "does",
+    "not",
+    "work",
+    "thanks",
+    "python",
+    "error",
+    "when",
+    "I",
+    "run",
+    "it",
+    "and/or",
+    "lol",
+    "def",
+    "import",
+    "async",
+    "await",
+    "3.12",
+)
+SHORTHAND = ("#1234", "disnake#1200", "onerandomusername/monty-python#42", "python/cpython#100000", "@user")
+GITHUB_URLS = (
+    "https://github.com/onerandomusername/monty-python/issues/1",
+    "https://github.com/python/cpython/pull/100000",
+    "https://github.com/DisnakeDev/disnake/discussions/900",
+)
+OTHER_URLS = ("https://docs.python.org/3/library/re.html", "https://pypi.org/project/disnake/", "https://xkcd.com/353/")
+
+
+def make_settings() -> ghretos.MatcherSettings:
+    """Return the settings of a guild with every auto-responder enabled."""
+    settings = ghretos.MatcherSettings.none()
+    settings.require_strict_type = False
+    settings.shorthand = True
+    settings.short_numberables = True
+    settings.issues = True
+    settings.pull_requests = True
+    settings.discussions = True
+    settings.issue_comments = True
+    settings.pull_request_comments = True
+    settings.pull_request_review_comments = True
+    settings.pull_request_reviews = True
+    settings.discussion_comments = True
+    return settings
+
+
+def make_messages(rng: random.Random, extras: tuple[str, ...]) -> list[str]:
+    """Return chat messages, each with one of the extras mixed in if any are provided."""
+    messages = []
+    for _ in range(MESSAGES):
+        words = rng.choices(WORDS, k=rng.randint(3, 30))
+        if extras:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(extras))
+        messages.append(" ".join(words))
+    return messages
+
+
+def parse(text: str, settings: ghretos.MatcherSettings, *, prefilter: bool) -> list[ghretos.GitHubResource]:
+    """Parse the message for resources, skipping repository resolution."""
+    return [
+        *parse_shorthand_segments(text, settings, prefilter=prefilter),
+        *parse_github_urls(extract_urls(text), settings, prefilter=prefilter),
+    ]
+
+
+def time_us(messages: list[str], settings: ghretos.MatcherSettings, *, prefilter: bool) -> float:
+    """Return the mean time taken to parse a message in microseconds."""
+    start = time.perf_counter()
+    for text in messages:
+        parse(text, settings, prefilter=prefilter)
+    return (time.perf_counter() - start) / len(messages) * 1_000_000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    rng = random.Random(0)
+    settings = make_settings()
+    corpora = {
+        "plain chat": make_messages(rng, ()),
+        "other urls": make_messages(rng, OTHER_URLS),
+        "shorthand": make_messages(rng, SHORTHAND),
+        "github urls": make_messages(rng, GITHUB_URLS),
+    }
+
+    print(f"{'messages':<16}{'before':>12}{'after':>12}{'same matches':>16}")  # noqa: T201
+    for label, messages in corpora.items():
+        before = time_us(messages, settings, prefilter=False)
+        after = time_us(messages, settings, prefilter=True)
+        same = all(parse(text, settings, prefilter=False) == parse(text, settings, prefilter=True) for text in messages)
+        print(f"{label:<16}{before:>10.1f}us{after:>10.1f}us{same!s:>16}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark PyPI package autocomplete at full index size.
+
+Compares the previous approach of fuzzy matching every package name against `PackageNameIndex.search`, using the
+live PyPI simple index. As the index only scores a subset of the names, it also reports how many of the index's top
+five results score as well as the full scan's result at the same rank. Names often tie, so scores are compared rather
+than names.
+
+    python -m scripts.benchmark_package_index
+"""
+
+import html
+import json
+import re
+import statistics
+import time
+import urllib.request
+
+import rapidfuzz.distance
+import rapidfuzz.process
+
+from monty.utils.package_index import PackageNameIndex, normalize_name
+
+
+SIMPLE_INDEX = "https://pypi.org/simple/"
+# the HTML form of the simple index, for mirrors which do not serve the JSON form
+_ANCHOR_RE = re.compile(r"<a [^>]*>([^<]+)</a>")
+QUERIES = (
+    "r",
+    "req",
+    "requests",
+    "django-rest",
+    "numpy",
+    "pyth",
+    "sqlalchemy-utils",
+    "disnake",
+    "xyzzy",
+    # typos, which break most of the query's trigrams
+    "reqeusts",
+    "djnago",
+    "nmupy",
+    "pandsa",
+    "pydnatic",
+    "matplotlb",
+    "scikit-lern",
+    "pillwo",
+)
+
+
+def fetch_names() -> list[str]:
+    """Fetch the name of every package on PyPI."""
+    request = urllib.request.Request(SIMPLE_INDEX, headers={"Accept": "application/vnd.pypi.simple.v1+json"})  # noqa: S310
+    with urllib.request.urlopen(request) as resp:  # noqa: S310
+        body = resp.read()
+        if resp.headers.get_content_type() == "text/html":
+            return [html.unescape(name) for name in _ANCHOR_RE.findall(body.decode())]
+    return [project["name"] for project in json.loads(body)["projects"]]
+
+
+def time_ms(func: "object", *args: object, repeat: int = 5) -> float:
+    """Return the median runtime of the call in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)  # type: ignore[operator]
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def full_scan(names: dict[str, str], query: str) -> list[str]:
+    """Fuzzy match the query against every normalised name, returning display names as the index does."""
+    results = rapidfuzz.process.extract(
+        normalize_name(query), names, scorer=rapidfuzz.distance.JaroWinkler.similarity, limit=25, score_cutoff=0.4
+    )
+    return [names[key] for _, _, key in results]
+
+
+def top_scores(query: str, results: list[str], count: int = 5) -> list[float]:
+    """Return the scores of the first results."""
+    key = normalize_name(query)
+    return [rapidfuzz.distance.JaroWinkler.similarity(key, normalize_name(name)) for name in results[:count]]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    names = fetch_names()
+    by_key: dict[str, str] = {}
+    for name in names:
+        by_key.setdefault(normalize_name(name), name)
+    print(f"{len(names):,} packages")  # noqa: T201
+
+    start = time.perf_counter()
+    index = PackageNameIndex.from_names(names)
+    print(f"index build: {(time.perf_counter() - start) * 1000:,.0f}ms")  # noqa: T201
+
+    print(f"{'query':<20}{'full scan':>12}{'index':>12}{'top 5':>8}  best match")  # noqa: T201
+    for query in QUERIES:
+        scan = time_ms(full_scan, by_key, query)
+        indexed = time_ms(index.search, query)
+        found = index.search(query)
+        expected_scores = top_scores(query, full_scan(by_key, query))
+        found_scores = top_scores(query, found)
+        matched = sum(score >= expected - 1e-9 for score, expected in zip(found_scores, expected_scores, strict=False))
+        best = found[0] if found else "-"
+        print(f"{query:<20}{scan:>10.1f}ms{indexed:>10.1f}ms{matched:>6}/{len(expected_scores)}  {best}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()